@@ -7,7 +7,6 @@ from typing import Final
 from typing import Iterable
 
 from oras.container import Container
-from ruamel.yaml import YAML
 from ruamel.yaml.scanner import ScannerError
 
 from pipeline_migration.actions.add_task import validate_bundle_ref
@@ -21,6 +20,7 @@ from pipeline_migration.actions.migrate.resolvers.transition_proxy import (
     DecentralizationTransitionResolverProxy,
 )
 from pipeline_migration.types import RenovateUpgradeT
+from pipeline_migration.utils import safe_load_yaml
 
 
 SUBCMD_DESCRIPTION: Final = """\
@@ -156,7 +156,7 @@ class DotTekton(Path):
         for possible_yaml_file in self.glob("*.y[a]ml"):
             doc = None
             with suppress(ScannerError, IOError):
-                doc = YAML().load(possible_yaml_file.read_text())
+                doc = safe_load_yaml(possible_yaml_file.read_text())
             if doc and isinstance(doc, dict):
                 kind = doc.get("kind")
                 if kind == "Pipeline" or kind == "PipelineRun":
@@ -1,11 +1,14 @@
 from collections.abc import Generator
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Final
 
 import requests
 
 from pipeline_migration.registry import Container
 
+# Maximum number of tags Quay responds per page of listRepoTags.
+TAGS_PER_PAGE: Final = 100
+
 
 @dataclass
 class QuayTagInfo:
@@ -23,7 +26,7 @@ class QuayTagInfo:
 
 
 def list_active_repo_tags(
-    c: Container, tag_name: str = "", tag_name_pattern: str = "", per_page: int = 0
+    c: Container, tag_name: str = "", tag_name_pattern: str = "", per_page: int = TAGS_PER_PAGE
 ) -> Generator[dict, Any, None]:
     """List repository tags
 
@@ -31,6 +34,11 @@ def list_active_repo_tags(
 
     :param c: container object.
     :type c: Container
+    :param per_page: number of tags to request per page. Defaults to the maximum page size, so
+        that most repositories are listed by a single request. Next pages are still requested as
+        long as Quay indicates there are more tags. If 0 is passed, Quay's default page size is
+        used.
+    :type per_page: int
     """
     page = 1
     while True:
@@ -1,16 +1,42 @@
-from typing import Final
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from functools import cached_property, lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, BinaryIO, Final
 import urllib.parse
 
 from dataclasses import dataclass
 
+import jsonschema
+import oras.defaults
+import oras.schemas
+import requests
 from oras.provider import Registry as OrasRegistry
-from oras.container import Container as OrasContainer
+from oras.container import Container as OrasContainer, docker_regex
 from oras.decorator import ensure_container
 from oras.types import container_type
+from requests.adapters import HTTPAdapter
 from requests.models import Response as Response
+from urllib3.response import BaseHTTPResponse
+from urllib3.util.retry import Retry
 
 from pipeline_migration.types import AnnotationsT, ImageIndexT, DescriptorT
 
+try:
+    # Optional, decoding large image indexes is faster than the standard json module.
+    import orjson
+
+    # Annotated to accept both implementations, whose signatures are different.
+    json_loads: Callable[[bytes | str], Any] = orjson.loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
 REGISTRY: Final = "quay.io"
 
 MEDIA_TYPE_OCI_EMTPY_V1: Final = "application/vnd.oci.empty.v1+json"
@@ -24,11 +50,276 @@ REGISTRY_ALLOWLIST: Final[list[str]] = [
     "quay.io/konflux-ci",
 ]
 
+# Size of chunks read from the response when streaming a blob.
+BLOB_CHUNK_SIZE: Final = 64 * 1024
+
+# Maximum number of requests sent to registries at the same time.
+MAX_CONCURRENT_REQUESTS: Final = 5
+
+# Response statuses indicating a registry is unavailable temporarily. Requests are retried on them.
+UNAVAILABLE_STATUSES: Final = frozenset([429, 500, 502, 503, 504])
+
+# Maximum seconds to wait for before retrying a request, even if a registry responds a longer
+# Retry-After. Requests are retried within the limit of concurrent requests, so a long wait would
+# stall all requests to registries.
+MAX_RETRY_AFTER: Final = 10
+
+# Codes of OCI errors responded with 404 for an image or repository that does not exist. A registry
+# responding them supports the API requested, e.g. Quay does for the referrers API.
+UNKNOWN_IMAGE_ERROR_CODES: Final = frozenset(["MANIFEST_UNKNOWN", "NAME_UNKNOWN"])
+
+# Number of consecutive failed requests to a registry, after which requests to it are stopped.
+# A request counts as failed once its retries are exhausted.
+CIRCUIT_BREAKER_THRESHOLD: Final = 5
+# Seconds for which requests to a failing registry are stopped.
+CIRCUIT_BREAKER_RESET_TIMEOUT: Final = 60
+
+
+class RegistryUnavailableError(requests.exceptions.ConnectionError):
+    """Requests to a registry are stopped because it keeps failing"""
+
+
+class _CappedRetry(Retry):
+    """Retry respecting header Retry-After up to :data:`MAX_RETRY_AFTER` seconds"""
+
+    def get_retry_after(self, response: BaseHTTPResponse) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+
+class RegistrySession(requests.Session):
+    """HTTP session shared by all Registry instances
+
+    Sharing the session allows reusing connections to registries. The number of concurrent
+    requests is limited, so that resolving migrations in parallel does not flood a registry.
+
+    Requests are retried with exponential backoff on responses in :data:`UNAVAILABLE_STATUSES`,
+    and header ``Retry-After`` is respected up to :data:`MAX_RETRY_AFTER` seconds. If requests
+    to a registry host still fail ``failure_threshold`` times in a row, further requests to the
+    host fail immediately with :class:`RegistryUnavailableError` for ``reset_timeout`` seconds.
+    After that, one request is sent to check whether the registry is back, while the others
+    still fail until it succeeds.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        failure_threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        reset_timeout: float = CIRCUIT_BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        super().__init__()
+        # Ignore all cookies like oras does for its own session.
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        retry = _CappedRetry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=UNAVAILABLE_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        # Key is the registry host. Value is a tuple of the number of consecutive failures and
+        # the time of the last failure.
+        self._failures: dict[str, tuple[int, float]] = {}
+        self._failures_lock = threading.Lock()
 
-@dataclass
+    def _check_availability(self, host: str) -> None:
+        with self._failures_lock:
+            failures, failed_at = self._failures.get(host, (0, 0.0))
+            if failures < self._failure_threshold:
+                return
+            now = time.monotonic()
+            if now - failed_at < self._reset_timeout:
+                raise RegistryUnavailableError(
+                    f"Requests to {host} are stopped after {failures} consecutive failures."
+                )
+            # Let this request check whether the registry is back, and restart the timeout for
+            # the others. If the request gets no result, another one is let after the timeout.
+            self._failures[host] = (failures, now)
+
+    def _record_result(self, host: str, failed: bool) -> None:
+        with self._failures_lock:
+            if failed:
+                failures, _ = self._failures.get(host, (0, 0.0))
+                self._failures[host] = (failures + 1, time.monotonic())
+            else:
+                self._failures.pop(host, None)
+
+    def request(self, method: str | bytes, url: str | bytes, *args, **kwargs) -> Response:
+        host = urllib.parse.urlsplit(url if isinstance(url, str) else url.decode()).netloc
+        self._check_availability(host)
+        try:
+            with self._request_slots:
+                response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.ConnectionError:
+            self._record_result(host, failed=True)
+            raise
+        self._record_result(host, failed=response.status_code in UNAVAILABLE_STATUSES)
+        return response
+
+
+_shared_session = RegistrySession()
+
+# Default maximum number of referrers responses kept in a cache.
+CACHE_SIZE: Final = 500
+# Default seconds a cached referrers response is valid for.
+CACHE_TTL: Final = 300
+
+
+class RegistryCache:
+    """Responses cached for requests to registries
+
+    Registry instances created with the default cache settings share one cache, like they share
+    the HTTP session. Hence the short-lived instances created for each lookup during a migration
+    reuse the responses got by each other.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = CACHE_TTL) -> None:
+        """
+        :param size: maximum number of referrers responses, and separately of responses with an
+            ETag, kept in the cache. 0 disables the cache.
+        :type size: int
+        :param ttl: seconds a cached referrers response is valid for, and a repository responding
+            404 to the referrers API is not requested again. Responses with an ETag do not
+            expire, since they are validated by the registry when they are used.
+        :type ttl: float
+        """
+        self.size = size
+        self.ttl = ttl
+        # Guard the cached data, which is reordered on read, when used from threads.
+        self.lock = threading.Lock()
+        # Key is the referrers API URL. Value is a tuple of expiration time and the image index.
+        self.referrers: OrderedDict[str, tuple[float, ImageIndexT]] = OrderedDict()
+        # Key is the referrers API URL. Value is the result of the request being sent, which
+        # concurrent calls for the same URL wait for instead of sending the request again.
+        self.inflight_referrers: dict[str, Future[ImageIndexT]] = {}
+        # Key is the request URL. Value is a tuple of the response ETag, the decoded JSON and the
+        # URL of the next page.
+        self.etags: OrderedDict[str, tuple[str, Any, str | None]] = OrderedDict()
+        # Key is the image repository. Value is the time when the referrers API is tried again.
+        self.referrers_unsupported: dict[str, float] = {}
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self.lock:
+            self.referrers.clear()
+            self.etags.clear()
+            self.referrers_unsupported.clear()
+
+    def get_referrers(self, referrers_api: str) -> ImageIndexT | None:
+        """Get a copy of the cached image index responded by the referrers API
+
+        :return: the image index, or None if it is not cached or is expired.
+        """
+        with self.lock:
+            cached = self.referrers.get(referrers_api)
+            if cached is None:
+                return None
+            expires_at, image_index = cached
+            if time.monotonic() >= expires_at:
+                del self.referrers[referrers_api]
+                return None
+            self.referrers.move_to_end(referrers_api)
+        return copy.deepcopy(image_index)
+
+    def is_referrers_unsupported(self, repository: str) -> bool:
+        """Check if the repository is known not supporting the referrers API
+
+        :return: True if the repository is marked and the mark is not expired yet.
+        """
+        with self.lock:
+            expires_at = self.referrers_unsupported.get(repository)
+            if expires_at is None:
+                return False
+            if time.monotonic() >= expires_at:
+                del self.referrers_unsupported[repository]
+                return False
+        return True
+
+    def mark_referrers_unsupported(self, repository: str) -> None:
+        """Mark the repository not supporting the referrers API until the cache TTL expires"""
+        if self.size <= 0:
+            return
+        with self.lock:
+            self.referrers_unsupported[repository] = time.monotonic() + self.ttl
+
+    def put_referrers(self, referrers_api: str, image_index: ImageIndexT) -> None:
+        """Cache a copy of the image index responded by the referrers API"""
+        if self.size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        image_index = copy.deepcopy(image_index)
+        with self.lock:
+            self.referrers[referrers_api] = (expires_at, image_index)
+            self.referrers.move_to_end(referrers_api)
+            while len(self.referrers) > self.size:
+                self.referrers.popitem(last=False)
+
+    def get_etag(self, url: str) -> tuple[str, Any, str | None] | None:
+        """Get the cached response with an ETag of given URL
+
+        :return: a tuple of the ETag, a copy of the decoded JSON and the URL of the next page, or
+            None if no response is cached.
+        """
+        with self.lock:
+            cached = self.etags.get(url)
+            if cached is None:
+                return None
+            self.etags.move_to_end(url)
+        etag, data, next_url = cached
+        return etag, copy.deepcopy(data), next_url
+
+    def put_etag(self, url: str, etag: str, data: Any, next_url: str | None) -> None:
+        """Cache a copy of the decoded JSON responded with an ETag"""
+        if self.size <= 0:
+            return
+        data = copy.deepcopy(data)
+        with self.lock:
+            self.etags[url] = (etag, data, next_url)
+            self.etags.move_to_end(url)
+            while len(self.etags) > self.size:
+                self.etags.popitem(last=False)
+
+
+_shared_cache = RegistryCache()
+
+
+class NotFoundError(ValueError):
+    """Registry responds 404 Not Found"""
+
+    def __init__(self, message: str, error_codes: frozenset[str] = frozenset()) -> None:
+        """
+        :param message: the error message.
+        :type message: str
+        :param error_codes: codes of the OCI errors in the response, e.g. ``MANIFEST_UNKNOWN``.
+        :type error_codes: frozenset[str]
+        """
+        super().__init__(message)
+        self.error_codes = error_codes
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Descriptor:
+    """Content descriptor
+
+    Descriptors are compared and hashed by digest, which identifies the described content.
+    """
+
     data: DescriptorT
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Descriptor):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
     @property
     def digest(self) -> str:
         return self.data["digest"]
@@ -38,7 +329,7 @@ class Descriptor:
         return self.data.get("annotations", {})
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ImageIndex:
     data: ImageIndexT
 
@@ -47,13 +338,70 @@ class ImageIndex:
         return [Descriptor(data=item) for item in self.data["manifests"]]
 
 
+@lru_cache(maxsize=4096)
+def _parse_image_reference(name: str) -> tuple[str, str | None, str | None, str | None, str | None]:
+    """Parse an image reference into its components
+
+    The same image references are parsed again and again during a migration, e.g. a bundle
+    repository for every tag within an upgrade range. The result is cached by the reference string.
+
+    :param name: the image reference to parse.
+    :type name: str
+    :return: a tuple of repository, registry, namespace, tag and digest. Components not included in
+        the reference are None.
+    :raises ValueError: if the reference is not a valid image reference.
+    """
+    match = docker_regex.search(name)
+    if not match:
+        raise ValueError(
+            f"{name} does not match a recognized registry unique resource identifier. "
+            "Try <registry>/<namespace>/<repository>:<tag|digest>"
+        )
+    namespace = match["namespace"]
+    if namespace:
+        namespace = namespace.strip("/")
+    return match["repository"], match["registry"], namespace, match["tag"], match["digest"]
+
+
 class Container(OrasContainer):
+    """Image reference
 
-    @property
+    URLs and URIs composed from the reference components are cached, and they are recomputed
+    once any component is changed.
+    """
+
+    # Reference components, from which the cached properties are computed.
+    _COMPONENTS: Final = frozenset(["registry", "namespace", "repository", "tag", "digest"])
+    _CACHED_PROPERTIES: Final = ("api_prefix", "uri", "referrers_url", "uri_with_tag")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in self._COMPONENTS:
+            for cached_property_name in self._CACHED_PROPERTIES:
+                self.__dict__.pop(cached_property_name, None)
+
+    def parse(self, name: str) -> None:
+        repository, registry, namespace, tag, digest = _parse_image_reference(name)
+        self.repository = repository
+        if registry:
+            self.registry = registry
+        self.namespace = namespace
+        self.tag = tag or oras.defaults.default_tag
+        self.digest = digest
+
+    @cached_property
+    def api_prefix(self) -> str:
+        return super().api_prefix
+
+    @cached_property
+    def uri(self) -> str:
+        return super().uri
+
+    @cached_property
     def referrers_url(self) -> str:
         return f"{self.registry}/v2/{self.api_prefix}/referrers/{self.digest}"
 
-    @property
+    @cached_property
     def uri_with_tag(self) -> str:
         """Include the tag in the uri
 
@@ -66,10 +414,138 @@ class Container(OrasContainer):
         return uri
 
 
+def _get_oras_do_request() -> Callable[..., Response]:
+    """Get Registry.do_request of oras without its retry decorator
+
+    :raises ImportError: if do_request is not decorated by the retry of oras only, e.g. the
+        decorators are changed by a new oras release.
+    """
+    do_request = OrasRegistry.do_request
+    wrapped = getattr(do_request, "__wrapped__", None)
+    if (
+        wrapped is None
+        or hasattr(wrapped, "__wrapped__")
+        or do_request.__code__.co_qualname != "retry.<locals>.decorator.<locals>.inner"
+    ):
+        raise ImportError("Registry.do_request of oras is not decorated by its retry only.")
+    return wrapped
+
+
+_oras_do_request: Final = _get_oras_do_request()
+
+
+def _get_error_codes(response: Response) -> frozenset[str]:
+    """Get codes of the OCI errors in the response body
+
+    :return: the error codes. It is empty if the body does not include OCI errors.
+    """
+    try:
+        errors = json_loads(response.content)["errors"]
+        return frozenset(
+            error["code"] for error in errors if isinstance(error, dict) and "code" in error
+        )
+    except (ValueError, KeyError, TypeError):
+        return frozenset()
+
+
 class Registry(OrasRegistry):
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self, *args, cache_size: int | None = None, cache_ttl: float | None = None, **kwargs
+    ):
+        """Create a registry client
+
+        If neither ``cache_size`` nor ``cache_ttl`` is specified, the cache shared by all
+        Registry instances is used. Otherwise, the instance has a cache of its own.
+
+        :param cache_size: maximum number of referrers responses kept in the cache. 0 disables
+            the cache. Defaults to :data:`CACHE_SIZE`.
+        :type cache_size: int or None
+        :param cache_ttl: seconds a cached referrers response, or a repository known not
+            supporting the referrers API, is valid for. Defaults to :data:`CACHE_TTL`.
+        :type cache_ttl: float or None
+        """
         super().__init__(*args, **kwargs)
+        self.session = self.auth.session = _shared_session
+        if cache_size is None and cache_ttl is None:
+            self._cache = _shared_cache
+        else:
+            self._cache = RegistryCache(
+                size=CACHE_SIZE if cache_size is None else cache_size,
+                ttl=CACHE_TTL if cache_ttl is None else cache_ttl,
+            )
+
+    def clear_cache(self) -> None:
+        """Remove all cached responses
+
+        If the cache is shared, it is cleared for all Registry instances.
+        """
+        self._cache.clear()
+
+    def do_request(self, *args, **kwargs) -> Response:
+        """Send a request and authenticate it if the registry asks for
+
+        Same as the oras one, but without its retry loop, which sleeps for minutes on any error,
+        including :class:`RegistryUnavailableError`. Failing requests are retried by
+        :class:`RegistrySession` instead.
+        """
+        return _oras_do_request(self, *args, **kwargs)
+
+    def _get_json(self, url: str, headers: dict[str, str] | None = None) -> Any:
+        """Get a JSON document from registry with a conditional request
+
+        The ETag of a response is remembered together with the decoded JSON. The next request to
+        the same URL includes header If-None-Match, then the remembered JSON is returned if the
+        registry responds 304 Not Modified.
+
+        :param url: the URL to get the JSON document from.
+        :type url: str
+        :param headers: additional request headers.
+        :type headers: dict[str, str] or None
+        :return: the decoded JSON document.
+        :raises NotFoundError: if the registry responds 404.
+        :raises ValueError: if the registry responds other error.
+        """
+        data, _ = self._get_json_page(url, headers=headers)
+        return data
+
+    def _get_json_page(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> tuple[Any, str | None]:
+        """Get a page of a paginated JSON document from registry
+
+        Same as :meth:`_get_json`, but the URL of the next page is also returned, which is
+        responded in header ``Link`` with ``rel="next"``.
+
+        :param url: the URL to get the JSON document from.
+        :type url: str
+        :param headers: additional request headers.
+        :type headers: dict[str, str] or None
+        :return: a tuple of the decoded JSON document and the absolute URL of the next page. The
+            URL is None if this is the last page.
+        :raises NotFoundError: if the registry responds 404.
+        :raises ValueError: if the registry responds other error.
+        """
+        request_headers = dict(headers or {})
+        cached = self._cache.get_etag(url)
+        if cached is not None:
+            request_headers["If-None-Match"] = cached[0]
+        resp = self.do_request(url, headers=request_headers)
+        if resp.status_code == 304 and cached is not None:
+            return cached[1], cached[2]
+        if resp.status_code == 404:
+            self._parse_response_errors(resp)
+            raise NotFoundError(
+                f"Issue with {resp.request.url}: {resp.reason}", _get_error_codes(resp)
+            )
+        self._check_200_response(resp)
+        data = json_loads(resp.content)
+        next_url = None
+        if next_link := resp.links.get("next", {}).get("url"):
+            next_url = urllib.parse.urljoin(url, next_link)
+        if etag := resp.headers.get("ETag"):
+            self._cache.put_etag(url, etag, data, next_url)
+        return data, next_url
 
     @ensure_container
     def get_blob(self, *args, **kwargs) -> Response:
@@ -78,9 +554,98 @@ class Registry(OrasRegistry):
         return response
 
     @ensure_container
-    def get_artifact(self, container: container_type, digest: str) -> str:
-        resp = self.get_blob(container, digest)
-        return resp.content.decode("utf-8")
+    def get_manifest(
+        self, container: container_type, allowed_media_type: list[str] | None = None
+    ) -> dict:
+        """Get image manifest
+
+        Same as the oras one, but the manifest is requested conditionally. Refer to
+        :meth:`_get_json`.
+        """
+        self.auth.load_configs(container)
+        if not allowed_media_type:
+            allowed_media_type = [oras.defaults.default_manifest_media_type]
+        headers = {"Accept": ";".join(allowed_media_type)}
+        manifest_url = f"{self.prefix}://{container.manifest_url()}"  # type: ignore
+        manifest = self._get_json(manifest_url, headers=headers)
+        jsonschema.validate(manifest, schema=oras.schemas.manifest)
+        return manifest
+
+    @ensure_container
+    def get_artifact(
+        self,
+        container: container_type,
+        digest: str,
+        writer: BinaryIO | None = None,
+        chunk_size: int = BLOB_CHUNK_SIZE,
+    ) -> str | None:
+        """Get artifact content
+
+        :param container: the image the artifact belongs to.
+        :type container: Container or str
+        :param digest: digest of the blob to get.
+        :type digest: str
+        :param writer: if specified, the blob is streamed into it chunk by chunk
+            and the content is verified against the digest. Otherwise, the whole
+            content is returned. The content is verified after it is streamed, hence
+            the writer may have received the whole content when ValueError is raised.
+        :type writer: BinaryIO or None
+        :param chunk_size: size of chunks read from the response when streaming.
+        :type chunk_size: int
+        :return: the decoded content, or None if it is written to the writer.
+        :raises ValueError: if the streamed content does not match the digest, or the digest
+            algorithm is not supported.
+        """
+        if writer is None:
+            resp = self.get_blob(container, digest)
+            return resp.content.decode("utf-8")
+        algorithm, sep, expected_hash = digest.partition(":")
+        if not sep or algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Cannot verify blob {digest}, unsupported digest algorithm.")
+        hasher = hashlib.new(algorithm)
+        with self.get_blob(container, digest, stream=True) as resp:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                hasher.update(chunk)
+                writer.write(chunk)
+        if hasher.hexdigest() != expected_hash:
+            raise ValueError(f"Content of blob {digest} does not match its digest.")
+        return None
+
+    def _get_referrers_api(self, c: Container, artifact_type: str | None) -> tuple[str, str]:
+        """Get referrers API URL of given image
+
+        :return: a tuple of the image repository and the URL.
+        :raises ValueError: if the image does not have a digest.
+        :raises NotFoundError: if the repository is known not supporting the referrers API.
+        """
+        if not c.digest:
+            raise ValueError("Missing digest in image.")
+        repository = f"{c.registry}/{c.api_prefix}"
+        if self._cache.is_referrers_unsupported(repository):
+            raise NotFoundError(f"Referrers API is not supported by {repository}.")
+        referrers_api = f"{self.prefix}://{c.referrers_url}"
+        query_args = ""
+        if artifact_type:
+            query_args = urllib.parse.urlencode([("artifactType", artifact_type)])
+        return repository, f"{referrers_api}?{query_args}"
+
+    def _iter_referrers_pages(self, repository: str, referrers_api: str) -> Iterator[ImageIndexT]:
+        """Request the referrers API page by page
+
+        The next page is requested when the previous one is consumed.
+        """
+        url: str | None = referrers_api
+        while url:
+            try:
+                image_index, url = self._get_json_page(url)
+            except NotFoundError as e:
+                # Registries supporting the referrers API respond an empty image index for images
+                # without referrers, or an error about the unknown image, e.g. Quay does. A 404 of
+                # the next pages is not about the API either.
+                if url == referrers_api and not e.error_codes & UNKNOWN_IMAGE_ERROR_CODES:
+                    self._cache.mark_referrers_unsupported(repository)
+                raise
+            yield image_index
 
     @ensure_container
     def list_referrers(self, c: Container, artifact_type: str | None = None) -> ImageIndexT:
@@ -92,14 +657,67 @@ class Registry(OrasRegistry):
         :type artifact_type: str or None
         :return: the raw JSON responded by the registry. That is an image
             index, where manifests field are the images referring the given one.
+            If the registry paginates the referrers, manifests of all the pages
+            are included. Responses are cached for the same image and artifact type.
+            Concurrent calls for the same image and artifact type share one request.
+        :raises NotFoundError: if the image repository does not support the referrers API.
+            Once a repository responds 404, subsequent calls fail without sending request.
         """
-        if not c.digest:
-            raise ValueError("Missing digest in image.")
-        referrers_api = f"{self.prefix}://{c.referrers_url}"
-        query_args = ""
-        if artifact_type:
-            query_args = urllib.parse.urlencode([("artifactType", artifact_type)])
-        referrers_api = f"{referrers_api}?{query_args}"
-        resp = self.do_request(referrers_api)
-        self._check_200_response(resp)
-        return resp.json()
+        repository, referrers_api = self._get_referrers_api(c, artifact_type)
+        image_index = self._cache.get_referrers(referrers_api)
+        if image_index is not None:
+            return image_index
+
+        with self._cache.lock:
+            inflight = self._cache.inflight_referrers.get(referrers_api)
+            if inflight is None:
+                result = self._cache.inflight_referrers[referrers_api] = Future()
+        if inflight is not None:
+            return copy.deepcopy(inflight.result())
+
+        try:
+            # The previous request may be done between checking the cache and the in-flight one.
+            cached_image_index = self._cache.get_referrers(referrers_api)
+            if cached_image_index is None:
+                pages = self._iter_referrers_pages(repository, referrers_api)
+                image_index = next(pages)
+                for page in pages:
+                    image_index["manifests"].extend(page["manifests"])
+                self._cache.put_referrers(referrers_api, image_index)
+            else:
+                image_index = cached_image_index
+            result.set_result(copy.deepcopy(image_index))
+        except BaseException as e:
+            # Including KeyboardInterrupt, otherwise the waiting calls would never return.
+            result.set_exception(e)
+            raise
+        finally:
+            with self._cache.lock:
+                del self._cache.inflight_referrers[referrers_api]
+        return image_index
+
+    @ensure_container
+    def iter_referrers(
+        self, c: Container, artifact_type: str | None = None
+    ) -> Iterator[Descriptor]:
+        """Iterate referrers of given image
+
+        Unlike :meth:`list_referrers`, pages of a paginated response are requested
+        on demand, so a caller stopping early does not request the remaining ones.
+        Cached responses of :meth:`list_referrers` are reused, but pages requested
+        here are not cached.
+
+        :param c: a Container object representing an image.
+        :type c: Container
+        :param artifact_type: query the referrers by artifact type.
+        :type artifact_type: str or None
+        :return: an iterator of descriptors of the images referring the given one.
+        :raises NotFoundError: if the image repository does not support the referrers API.
+        """
+        repository, referrers_api = self._get_referrers_api(c, artifact_type)
+        image_index = self._cache.get_referrers(referrers_api)
+        if image_index is not None:
+            yield from ImageIndex(data=image_index).manifests
+            return
+        for page in self._iter_referrers_pages(repository, referrers_api):
+            yield from ImageIndex(data=page).manifests
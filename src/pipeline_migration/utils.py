@@ -1,6 +1,8 @@
 import hashlib
 import logging
+from contextlib import suppress
 from dataclasses import dataclass, field
+from io import StringIO
 from typing import Any
 from pathlib import Path
 import subprocess
@@ -9,6 +11,7 @@ from pipeline_migration.types import FilePath
 
 from ruamel.yaml import YAML, CommentedMap, CommentedSeq
 from ruamel.yaml.comments import CommentedBase
+from ruamel.yaml.error import YAMLError
 
 
 __all__ = [
@@ -17,6 +20,7 @@ __all__ = [
     "dump_yaml",
     "is_true",
     "load_yaml",
+    "safe_load_yaml",
     "YAMLStyle",
     "git_add",
 ]
@@ -91,7 +95,17 @@ class YAMLStyle:
 
     @classmethod
     def detect(cls, file_path: FilePath) -> "YAMLStyle":
-        doc = load_yaml(file_path)
+        return cls.detect_text(Path(file_path).read_text(encoding="utf-8"))
+
+    @classmethod
+    def detect_text(cls, text: str) -> "YAMLStyle":
+        """Detect style from YAML content that is already read into memory
+
+        :param text: the YAML content.
+        :type text: str
+        :return: the detected style.
+        """
+        doc = create_yaml_obj().load(text)
         indentation = cls._detect_block_sequence_indentation(doc)
         return cls(indentation=indentation)
 
@@ -118,9 +132,47 @@ def load_yaml(yaml_file: FilePath, style: YAMLStyle | None = None) -> Any:
         return create_yaml_obj(style).load(f)
 
 
+def safe_load_yaml(content: str) -> Any:
+    """Load YAML content for reading only
+
+    The libyaml based loader is tried first, which is much faster than the round-trip loader
+    used by :func:`load_yaml`. Since libyaml is stricter than ruamel.yaml, the content is loaded
+    by the round-trip loader once libyaml rejects it. Comments and formatting are not preserved
+    by the libyaml loader, hence use this function only when the loaded data is read, e.g. to
+    check the kind of a document.
+
+    :param content: the YAML content.
+    :type content: str
+    :return: the loaded data.
+    :raises YAMLError: if the content is not valid YAML.
+    """
+    with suppress(YAMLError):
+        return YAML(typ="safe").load(content)
+    return create_yaml_obj().load(content)
+
+
 def dump_yaml(yaml_file: FilePath, data: Any, style: YAMLStyle | None = None) -> None:
+    """Dump data into a YAML file
+
+    The file is not written if it has the same content as the dumped YAML already. This avoids
+    rewriting pipeline files that are not changed by a load-dump round-trip.
+
+    :param yaml_file: path to the YAML file to write.
+    :type yaml_file: FilePath
+    :param data: data to be dumped.
+    :type data: Any
+    :param style: YAML style used to dump the data.
+    :type style: YAMLStyle or None
+    """
+    stream = StringIO()
+    create_yaml_obj(style).dump(data, stream)
+    content = stream.getvalue()
+    # Compare bytes, so that a file with other newlines or encoding is still rewritten.
+    with suppress(OSError):
+        if Path(yaml_file).read_bytes() == content.encode("utf-8"):
+            return
     with open(yaml_file, "w", encoding="utf-8") as f:
-        create_yaml_obj(style).dump(data, f)
+        f.write(content)
 
 
 def file_checksum(file_path: FilePath) -> str:
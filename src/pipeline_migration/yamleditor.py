@@ -4,14 +4,20 @@ import os
 import tempfile
 import textwrap
 from pathlib import Path
-from collections.abc import Sequence
-from typing import Union, TypeAlias, List, Tuple, Any
-from io import StringIO
+from collections.abc import Iterable, Sequence
+from typing import BinaryIO, Union, TypeAlias, List, Tuple, Any
+from io import BufferedReader, StringIO
 
 from ruamel.yaml import CommentedMap, CommentedSeq
 
 
-from pipeline_migration.utils import load_yaml, create_yaml_obj, YAMLStyle, is_flow_style_seq
+from pipeline_migration.utils import (
+    load_yaml,
+    create_yaml_obj,
+    safe_load_yaml,
+    YAMLStyle,
+    is_flow_style_seq,
+)
 
 # YAMLPath type represents path to YAML entity as sequences of strings
 # (for dictionaries) and integers (for arrays). Sequence items represent
@@ -24,10 +30,16 @@ from pipeline_migration.utils import load_yaml, create_yaml_obj, YAMLStyle, is_f
 #
 YAMLPath: TypeAlias = Sequence[Union[int, str]]
 PathStack: TypeAlias = List[Tuple[CommentedSeq | CommentedMap, str | int | None]]
+# An edit for EditYAMLEntry.apply_edits, e.g.
+# {"kind": "insert", "path": ["spec", "tasks"], "data": {"name": "task"}}
+YAMLEdit: TypeAlias = dict[str, Any]
 
 # End of file constant
 EOF = -1
 
+# Buffer size used to copy the unchanged tail of a file into the rewritten one
+COPY_CHUNK_SIZE = 128 * 1024
+
 
 class EditYAMLEntry:
     """Provides manipulation interface to YAML files using direct writes
@@ -37,6 +49,10 @@ class EditYAMLEntry:
 
     It supports inserting, replacing and deleting operations.
 
+    Validity of the YAML file is checked after each operation. To apply several operations,
+    use the editor as a context manager. Then the validity is checked once at the end, and the
+    original content is restored if any operation fails or the result is not valid.
+
     Functionality relays on ruamel.yaml parser ability, to provide "lc" line/column
     attribute that points to the exact location of the objects in the YAML file.
     Then exact line number range from to where should be content in file updated is
@@ -54,6 +70,36 @@ class EditYAMLEntry:
         self.yaml_file_path = yaml_file_path
         self.style = style
         self._data = None
+        # Content of the file before a batch of operations, which is set within a with block.
+        self._original_content: bytes | None = None
+
+    def __enter__(self) -> "EditYAMLEntry":
+        self._original_content = Path(self.yaml_file_path).read_bytes()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        original_content = self._original_content
+        assert original_content is not None
+        self._original_content = None
+        if exc_type is not None:
+            self._restore(original_content)
+            return
+        try:
+            post_test_yaml_validity(self.yaml_file_path)
+        except RuntimeError:
+            self._restore(original_content)
+            raise
+
+    def _restore(self, content: bytes) -> None:
+        Path(self.yaml_file_path).write_bytes(content)
+        self.invalidate_yaml_data()
+
+    @property
+    def _validation_callback(self):
+        """Validation of the YAML file after each operation, which is skipped within a batch"""
+        if self._original_content is None:
+            return post_test_yaml_validity
+        return None
 
     @property
     def data(self):
@@ -158,7 +204,7 @@ class EditYAMLEntry:
             # insert before the next entry
             lineno = next_entry_line
         insert_text_at_line(
-            self.yaml_file_path, lineno, yaml_str, validation_callback=post_test_yaml_validity
+            self.yaml_file_path, lineno, yaml_str, validation_callback=self._validation_callback
         )
         self.invalidate_yaml_data()
 
@@ -227,7 +273,7 @@ class EditYAMLEntry:
             lineno,
             yaml_str,
             replace_lines=remove_lines_num,
-            validation_callback=post_test_yaml_validity,
+            validation_callback=self._validation_callback,
         )
         self.invalidate_yaml_data()
 
@@ -269,8 +315,6 @@ class EditYAMLEntry:
             # Parent is not empty, just replace it
             return self.replace(parent_path, parent_node)
 
-        path_stack = self._get_path_stack(path)
-
         # if the entry is the only item of parent, remove also the parent
         while len(path_stack) > 1:
             parent_node, _ = path_stack[-2]
@@ -316,10 +360,35 @@ class EditYAMLEntry:
             self.yaml_file_path,
             lineno,
             remove_lines_num,
-            validation_callback=post_test_yaml_validity,
+            validation_callback=self._validation_callback,
         )
         self.invalidate_yaml_data()
 
+    def apply_edits(self, edits: Iterable[YAMLEdit]) -> None:
+        """Apply several edits as a single batch.
+
+        Each edit has a ``kind``, which is one of insert, replace or delete, a ``path`` and,
+        except for delete, the ``data``. Edits are applied in the given order, so a path refers
+        to the document as modified by the preceding edits. Validity of the YAML file is checked
+        once after all edits, and the original content is restored if any edit fails.
+
+        :param edits: edits to apply
+        :type edits: Iterable[YAMLEdit]
+        :raises ValueError: if an edit kind is unknown
+        """
+        batch = contextlib.nullcontext() if self._original_content is not None else self
+        with batch:
+            for edit in edits:
+                kind = edit["kind"]
+                if kind == "insert":
+                    self.insert(edit["path"], edit["data"])
+                elif kind == "replace":
+                    self.replace(edit["path"], edit["data"])
+                elif kind == "delete":
+                    self.delete(edit["path"])
+                else:
+                    raise ValueError(f"Unknown edit kind: {kind}")
+
     def _is_parent_dict(self, path_stack):
         if len(path_stack) > 1:
             parent, _ = path_stack[-2]
@@ -351,10 +420,12 @@ class EditYAMLEntry:
 
                 assert isinstance(index, str)
                 # we rely on python dict feature that ordering is kept
-                keys = tuple(node.keys())
-                key_idx = keys.index(index)
-                if len(keys) - 1 > key_idx:
-                    next_key = keys[key_idx + 1]
+                keys = iter(node)
+                for key in keys:
+                    if key == index:
+                        break
+                # the key right after the index one, if any, is the sibling
+                for next_key in keys:
                     line, _ = node.lc.key(next_key)
                     return line
 
@@ -458,6 +529,33 @@ class EditYAMLEntry:
         return path_stack, data
 
 
+def _copy_file_tail(src: BufferedReader, dst: BinaryIO) -> None:
+    """Copy the rest of src into dst
+
+    The content is copied by the kernel with os.sendfile if it is supported for regular files,
+    e.g. on Linux. Otherwise, it is copied through a single buffer of COPY_CHUNK_SIZE bytes,
+    so that no new bytes object is allocated for each chunk read.
+    """
+    offset = src.tell()
+    if hasattr(os, "sendfile"):
+        dst.flush()
+        try:
+            while sent := os.sendfile(dst.fileno(), src.fileno(), offset, COPY_CHUNK_SIZE):
+                offset += sent
+        except OSError:
+            pass  # not supported, copy the rest below
+        else:
+            return  # reached the end, the buffer is not needed
+        finally:
+            # sendfile does not move the position of src
+            src.seek(offset)
+
+    with memoryview(bytearray(COPY_CHUNK_SIZE)) as buf:
+        while n := src.readinto(buf):
+            with buf[:n] as chunk:
+                dst.write(chunk)
+
+
 def post_test_yaml_validity(path):
     """Validate if update yaml is valid
 
@@ -465,7 +563,7 @@ def post_test_yaml_validity(path):
     Rather fail early than provide false positive success.
     """
     try:
-        load_yaml(path)
+        safe_load_yaml(Path(path).read_text(encoding="utf-8"))
     except Exception as e:
         raise RuntimeError("post-check: generated YAML is not valid") from e
 
@@ -496,40 +594,35 @@ def remove_lines_from_file(
     # start_line is already 0-indexed
     start_index = start_line
 
-    end_index = start_index + num_lines
-    if num_lines < 0:  # till EOF
-        end_index = -1
-
     # Create a temporary file in the same directory as the original
     temp_dir = os.path.dirname(file_path) or "."
-    temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir, text=True)
+    temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir)
 
     try:
+        # Lines are handled as bytes, so that the remaining content after the removal range
+        # is copied in chunks without being decoded and split into lines.
         with (
-            os.fdopen(temp_fd, "w", encoding="utf-8") as temp_file,
-            open(file_path, "r", encoding="utf-8") as original_file,
+            os.fdopen(temp_fd, "wb") as temp_file,
+            open(file_path, "rb") as original_file,
         ):
-            current_line = 0
-
-            for line in original_file:
-                # Copy lines before the removal range
+            # Copy lines before the removal range
+            for current_line in range(start_index + 1):
+                line = original_file.readline()
+                if not line:
+                    raise ValueError(
+                        f"start_line ({start_line}) is beyond the file "
+                        f"length (max index: {current_line - 1})"
+                    )
                 if current_line < start_index:
                     temp_file.write(line)
-                # Skip lines in the removal range
-                elif current_line < end_index or end_index < 0:  # till EOF
-                    pass  # Skip this line
-                # Copy lines after the removal range
-                else:
-                    temp_file.write(line)
-
-                current_line += 1
 
-            # Check if start_line was beyond the file length
-            if start_index >= current_line:
-                raise ValueError(
-                    f"start_line ({start_line}) is beyond the file "
-                    f"length (max index: {current_line - 1})"
-                )
+            # The first line of the removal range is read already. Skip the rest of the range.
+            if num_lines > 0:
+                for _ in range(num_lines - 1):
+                    if not original_file.readline():
+                        break
+                # Copy lines after the removal range
+                _copy_file_tail(original_file, temp_file)
 
         if validation_callback is not None:
             validation_callback(temp_path)
@@ -579,46 +672,36 @@ def insert_text_at_line(
 
     # Create a temporary file in the same directory as the original
     temp_dir = os.path.dirname(file_path) or "."
-    temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir, text=True)
+    temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir)
 
     try:
+        # Like remove_lines_from_file, lines are handled as bytes and the content after the
+        # insertion point is copied in chunks.
         with (
-            os.fdopen(temp_fd, "w", encoding="utf-8") as temp_file,
-            open(file_path, "r", encoding="utf-8") as original_file,
+            os.fdopen(temp_fd, "wb") as temp_file,
+            open(file_path, "rb") as original_file,
         ):
-            current_line = 0
-            replacing_lines_in_progress = 0
-
-            for line in original_file:
-                if replacing_lines_in_progress > 0:
-                    replacing_lines_in_progress -= 1
-                    current_line += 1
-                    continue
-
-                if current_line == insert_index:
-                    # Write the new text
-                    temp_file.write(text_to_insert)
-                    if replace_lines > 0:
-                        # one line is removed as part of this (with continue statement)
-                        replacing_lines_in_progress = replace_lines - 1
-                        current_line += 1
-                        continue
-                    elif replace_lines < 0:
-                        # replacing till EOF
-                        current_line += 1  # increase counter before break, so we don't insert again
+            if insert_index < 0:
+                # Append at the end of file
+                _copy_file_tail(original_file, temp_file)
+                temp_file.write(text_to_insert.encode("utf-8"))
+            else:
+                # Copy lines before the insertion point. If the file is shorter than that,
+                # the text is appended at the end of file.
+                for _ in range(insert_index):
+                    line = original_file.readline()
+                    if not line:
                         break
-
-                    temp_file.write(line)
-                else:
-                    # Copy the original line
                     temp_file.write(line)
 
-                current_line += 1
+                temp_file.write(text_to_insert.encode("utf-8"))
 
-            # Handle case where line_number is beyond file length or insert_index is negative
-            # to append at the end file
-            if insert_index < 0 or current_line <= insert_index:
-                temp_file.write(text_to_insert)
+                # Skip the replaced lines, unless replacing till EOF
+                if replace_lines >= 0:
+                    for _ in range(replace_lines):
+                        if not original_file.readline():
+                            break
+                    _copy_file_tail(original_file, temp_file)
 
         if validation_callback is not None:
             validation_callback(temp_path)
@@ -1,5 +1,4 @@
 import pytest
-from pathlib import Path
 from textwrap import dedent
 
 from pipeline_migration.actions.modify.generic import (
@@ -11,12 +10,7 @@ from pipeline_migration.actions.modify.generic import (
     _yaml_from_value_param,
 )
 from pipeline_migration.utils import load_yaml, YAMLStyle
-
-
-def read_file_content(file_path: Path) -> str:
-    """Helper function to read file content."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+from tests.utils import read_file_content
 
 
 @pytest.fixture
@@ -9,12 +9,7 @@ from pipeline_migration.actions.modify.task import (
     TaskNotFoundError,
 )
 from pipeline_migration.utils import load_yaml, YAMLStyle
-
-
-def read_file_content(file_path: str) -> str:
-    """Helper function to read file content."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+from tests.utils import read_file_content
 
 
 @pytest.fixture
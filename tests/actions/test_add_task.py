@@ -101,7 +101,7 @@ IMAGE_DIGEST: Final = generate_digest()
 def test_task_bundle_reference(bundle_ref, responded_tags, expected_error, expected_output) -> None:
     if responded_tags is not None:
         tag = bundle_ref.split("@")[0].split(":")[-1]
-        params = {"page": "1", "onlyActiveTags": "true", "specificTag": tag}
+        params = {"page": "1", "onlyActiveTags": "true", "limit": "100", "specificTag": tag}
         responses.get(
             "https://quay.io/api/v1/repository/org/app/tag/",
             json={"tags": responded_tags, "has_additional": False},
@@ -102,7 +102,9 @@ def mock_get_digest_for_specific_tag(image_repo: str, version: str, expected_dig
         f"https://quay.io/api/v1/repository/{image_repo}/tag/",
         json={"tags": [{"manifest_digest": expected_digest}], "has_additional": False},
         match=[
-            query_param_matcher({"page": "1", "onlyActiveTags": "true", "specificTag": version}),
+            query_param_matcher(
+                {"page": "1", "onlyActiveTags": "true", "limit": "100", "specificTag": version}
+            ),
         ],
     )
 
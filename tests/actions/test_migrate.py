@@ -86,9 +86,19 @@ def mock_list_repo_tags_with_filter_tag_name(
             tag_groups[version] = []
     for version, its_tags in tag_groups.items():
         responses.get(
-            f"{api_url}?page=1&onlyActiveTags=true&filter_tag_name=like:{version}-",
+            api_url,
             json={"tags": its_tags, "page": 1, "has_additional": False},
             status=status,
+            match=[
+                matchers.query_param_matcher(
+                    {
+                        "page": "1",
+                        "onlyActiveTags": "true",
+                        "limit": "100",
+                        "filter_tag_name": f"like:{version}-",
+                    }
+                )
+            ],
         )
 
 
@@ -804,12 +814,22 @@ class TestLinkedMigrationsResolver:
         )
 
         c = Container(tb_upgrade.dep_name)
+        api_url = f"https://{c.registry}/api/v1/repository/{c.namespace}/{c.repository}/tag/"
         for version in ["0.1", "0.2"]:
             responses.add(
                 responses.GET,
-                f"https://{c.registry}/api/v1/repository/{c.namespace}/{c.repository}/tag/?"
-                f"page=1&onlyActiveTags=true&filter_tag_name=like:{version}-",
+                api_url,
                 json={"tags": [], "page": 1, "has_additional": False},
+                match=[
+                    matchers.query_param_matcher(
+                        {
+                            "page": "1",
+                            "onlyActiveTags": "true",
+                            "limit": "100",
+                            "filter_tag_name": f"like:{version}-",
+                        }
+                    )
+                ],
             )
 
         resolver = LinkedMigrationsResolver()
@@ -1116,8 +1136,18 @@ def test_drop_out_of_order_versions(tags_info, bundle_upgrade, expected):
         )
 
     responses.get(
-        f"{api_url}?page=1&onlyActiveTags=true&filter_tag_name=like:0.100-",
+        api_url,
         json={"tags": [], "page": 1, "has_additional": False},
+        match=[
+            matchers.query_param_matcher(
+                {
+                    "page": "1",
+                    "onlyActiveTags": "true",
+                    "limit": "100",
+                    "filter_tag_name": "like:0.100-",
+                }
+            )
+        ],
     )
 
     tags = list_bundle_tags(bundle_upgrade)
@@ -1155,6 +1185,7 @@ class TestMigrationImagesResolver:
                     {
                         "page": "1",
                         "onlyActiveTags": "true",
+                        "limit": "100",
                         "filter_tag_name": "like:" + MIGRATION_IMAGE_TAG_LIKE_PATTERN,
                     },
                 )
@@ -1193,6 +1224,7 @@ class TestMigrationImagesResolver:
                     {
                         "page": "1",
                         "onlyActiveTags": "true",
+                        "limit": "100",
                         "filter_tag_name": "like:" + MIGRATION_IMAGE_TAG_LIKE_PATTERN,
                     },
                 )
@@ -1286,6 +1318,7 @@ class TestMigrationImagesResolver:
                     {
                         "page": "1",
                         "onlyActiveTags": "true",
+                        "limit": "100",
                         "filter_tag_name": "like:" + MIGRATION_IMAGE_TAG_LIKE_PATTERN,
                     },
                 )
@@ -317,8 +317,9 @@ def mock_quay_list_tags(image_repo: str, tags: list[dict]) -> None:
     assert image_repo != ""
     api_url = f"https://quay.io/api/v1/repository/{image_repo}/tag/"
     responses.get(
-        f"{api_url}?page=1&onlyActiveTags=true",
+        api_url,
         json={"tags": tags, "page": 1, "has_additional": False},
+        match=[query_param_matcher({"page": "1", "onlyActiveTags": "true", "limit": "100"})],
     )
 
 
@@ -702,7 +703,7 @@ class TestMigrateTaskBundleUpgrade:
 
         def subprocess_run(cmd, *args, **kwargs):
             assert not kwargs.get("check")
-            content = open(cmd[1], "r").read().encode()
+            content = Path(cmd[1]).read_bytes()
 
             if content == first_migration_to_run:
                 # only fail the first migration of clone task
@@ -1328,7 +1329,7 @@ def test_apply_migration_by_bundle_references(
     (component_a_repo.tekton_dir / "push.yaml").write_text(push_pipeline_run_yaml)
 
     def mock_get_active_tag(image_repo: str, tag: str, tags: list[dict[str, str]]) -> None:
-        params = {"page": "1", "onlyActiveTags": "true", "specificTag": tag}
+        params = {"page": "1", "onlyActiveTags": "true", "limit": "100", "specificTag": tag}
         responses.get(
             f"https://quay.io/api/v1/repository/{image_repo}/tag/",
             json={"tags": tags, "has_additional": False},
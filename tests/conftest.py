@@ -1,9 +1,9 @@
 import pytest
 from copy import deepcopy
+from itertools import count
 from textwrap import dedent
 from typing import Final
 from pathlib import Path
-import tempfile
 
 import responses
 from responses import matchers
@@ -24,11 +24,29 @@ from pipeline_migration.registry import (
     MEDIA_TYPE_OCI_IMAGE_LAYER_V1_TAR,
     MEDIA_TYPE_OCI_IMAGE_LAYER_V1_TAR_GZ,
     MEDIA_TYPE_OCI_IMAGE_MANIFEST_V1,
+    RegistryCache,
+    RegistrySession,
 )
 
 from tests.utils import generate_digest, RepoPath
 
 
+@pytest.fixture(autouse=True)
+def registry_cache(monkeypatch) -> RegistryCache:
+    """Give each test a separate cache shared by Registry instances"""
+    cache = RegistryCache()
+    monkeypatch.setattr("pipeline_migration.registry._shared_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def registry_session(monkeypatch) -> RegistrySession:
+    """Give each test a separate shared session, which records failures of registries"""
+    session = RegistrySession()
+    monkeypatch.setattr("pipeline_migration.registry._shared_session", session)
+    return session
+
+
 @pytest.fixture
 def image_manifest() -> ManifestT:
     """Example image manifest that tests can customize for themselves"""
@@ -305,12 +323,13 @@ def component_b_repo(tmp_path, pipeline_yaml) -> RepoPath:
 
 @pytest.fixture
 def create_yaml_file(tmp_path):
-    def _create(yaml_content) -> Path:
-        with tempfile.NamedTemporaryFile(
-            dir=tmp_path, mode="w", delete=False, suffix=".yaml", encoding="utf-8"
-        ) as f:
-            f.write(yaml_content)
-            tmp_file = Path(f.name)
+    file_numbers = count()
+
+    def _create(yaml_content: str | bytes) -> Path:
+        if isinstance(yaml_content, str):
+            yaml_content = yaml_content.encode("utf-8")
+        tmp_file = tmp_path / f"created-{next(file_numbers)}.yaml"
+        tmp_file.write_bytes(yaml_content)
         return tmp_file
 
     return _create
@@ -331,6 +350,7 @@ def mock_migration_images(mock_get_manifest_for_migration):
                     {
                         "page": "1",
                         "onlyActiveTags": "true",
+                        "limit": "100",
                         "filter_tag_name": "like:" + MIGRATION_IMAGE_TAG_LIKE_PATTERN,
                     },
                 )
@@ -1,4 +1,5 @@
 import responses
+from responses import matchers
 
 from pipeline_migration.registry import Container
 from pipeline_migration.quay import list_active_repo_tags
@@ -13,8 +14,13 @@ class TestListActiveRepoTags:
 
         responses.add(
             responses.GET,
-            "https://quay.io/api/v1/repository/ns/app/tag/?page=1&onlyActiveTags=true",
+            "https://quay.io/api/v1/repository/ns/app/tag/",
             json={"tags": tags, "page": 1, "has_additional": False},
+            match=[
+                matchers.query_param_matcher(
+                    {"page": "1", "onlyActiveTags": "true", "limit": "100"}
+                )
+            ],
         )
 
         got = list_active_repo_tags(Container(repository))
@@ -29,12 +35,22 @@ class TestListActiveRepoTags:
         api_url = "https://quay.io/api/v1/repository/ns/app/tag/"
 
         responses.get(
-            f"{api_url}?page=1&onlyActiveTags=true",
+            api_url,
             json={"tags": tags_page_1, "page": 1, "has_additional": True},
+            match=[
+                matchers.query_param_matcher(
+                    {"page": "1", "onlyActiveTags": "true", "limit": "100"}
+                )
+            ],
         )
         responses.get(
-            f"{api_url}?page=2&onlyActiveTags=true",
+            api_url,
             json={"tags": tags_page_2, "page": 2, "has_additional": False},
+            match=[
+                matchers.query_param_matcher(
+                    {"page": "2", "onlyActiveTags": "true", "limit": "100"}
+                )
+            ],
         )
 
         got = list_active_repo_tags(Container(repository))
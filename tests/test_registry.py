@@ -1,19 +1,56 @@
-import copy
+import functools
+import hashlib
+import io
+import json
+import time
+import urllib.parse
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import FrozenInstanceError
+
 import pytest
+import requests
 import responses
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+from responses import matchers
+from oras.container import Container as OrasContainer
+from oras.decorator import retry
+from oras.provider import Registry as OrasRegistry
 
 from tests.utils import generate_digest
 from pipeline_migration.registry import (
+    CACHE_TTL,
     Container,
     Descriptor,
     ImageIndex,
     MEDIA_TYPE_OCI_IMAGE_INDEX_V1,
     MEDIA_TYPE_OCI_IMAGE_MANIFEST_V1,
+    NotFoundError,
     Registry,
+    RegistrySession,
+    RegistryUnavailableError,
+    _get_oras_do_request,
+    _oras_do_request,
 )
 from pipeline_migration.types import DescriptorT, ImageIndexT
 
 
+@pytest.fixture(scope="module", autouse=True)
+def activate_responses():
+    """Activate the HTTP mocks once for all the tests in this module"""
+    responses.start()
+    yield
+    responses.stop()
+
+
+@pytest.fixture(autouse=True)
+def reset_responses():
+    """Remove the HTTP mocks and recorded calls registered by a test"""
+    yield
+    responses.reset()
+
+
 @pytest.mark.parametrize("tag", ["", "0.1"])
 def test_container_uri_with_tag(tag):
     image = "reg.io/ns/app"
@@ -26,42 +63,128 @@ def test_container_uri_with_tag(tag):
         assert c.uri_with_tag == c.uri
 
 
-REFERRER_DESCRIPTOR: DescriptorT = {
-    "mediaType": MEDIA_TYPE_OCI_IMAGE_MANIFEST_V1,
-    "digest": "sha256:1234567",
-    "size": 100,
-    "artifactType": "text/plain",
-    "annotations": {},
-}
+@pytest.mark.parametrize(
+    "component,value,expected_uri,expected_referrers_url",
+    [
+        ["registry", "r2.io", "r2.io/ns/app:0.1@sha256:12", "r2.io/v2/ns/app/referrers/sha256:12"],
+        [
+            "namespace",
+            "ns2",
+            "reg.io/ns2/app:0.1@sha256:12",
+            "reg.io/v2/ns2/app/referrers/sha256:12",
+        ],
+        [
+            "repository",
+            "app2",
+            "reg.io/ns/app2:0.1@sha256:12",
+            "reg.io/v2/ns/app2/referrers/sha256:12",
+        ],
+        ["tag", "0.2", "reg.io/ns/app:0.2@sha256:12", "reg.io/v2/ns/app/referrers/sha256:12"],
+        [
+            "digest",
+            "sha256:34",
+            "reg.io/ns/app:0.1@sha256:34",
+            "reg.io/v2/ns/app/referrers/sha256:34",
+        ],
+    ],
+)
+def test_container_cached_properties_follow_changes(
+    component, value, expected_uri, expected_referrers_url
+):
+    c = Container("reg.io/ns/app:0.1@sha256:12")
+    assert c.uri_with_tag == "reg.io/ns/app:0.1@sha256:12"
+    assert c.referrers_url == "reg.io/v2/ns/app/referrers/sha256:12"
+    setattr(c, component, value)
+    assert c.uri_with_tag == expected_uri
+    assert c.referrers_url == expected_referrers_url
+
+
+@pytest.mark.parametrize(
+    "image",
+    [
+        "app",
+        "reg.io/app:0.1",
+        "reg.io/ns/app",
+        "reg.io/ns/sub/app:0.1",
+        "reg.io/ns/app@sha256:1234567",
+        "reg.io:5000/ns/app:0.1@sha256:1234567",
+    ],
+)
+def test_container_parse_image_reference(image):
+    c = Container(image)
+    oras_c = OrasContainer(image)
+    for attr in ("registry", "namespace", "repository", "tag", "digest"):
+        assert getattr(c, attr) == getattr(oras_c, attr)
+    # Parsing the same reference again reuses the cached components.
+    assert Container(image).uri == c.uri
+
+
+def test_container_parse_invalid_image_reference():
+    with pytest.raises(ValueError, match="does not match a recognized registry"):
+        Container("reg.io/ns/app:")
+
+
+def make_referrer() -> DescriptorT:
+    """Make a referrer descriptor
 
+    Each call returns a new descriptor, so tests can modify it without affecting others.
+    """
+    return {
+        "mediaType": MEDIA_TYPE_OCI_IMAGE_MANIFEST_V1,
+        "digest": "sha256:1234567",
+        "size": 100,
+        "artifactType": "text/plain",
+        "annotations": {},
+    }
 
-IMAGE_INDEX: ImageIndexT = {
-    "schemaVersion": 2,
-    "mediaType": MEDIA_TYPE_OCI_IMAGE_INDEX_V1,
-    "manifests": [],
-    "annotations": {},
-}
+
+def make_image_index(manifests: Iterable[DescriptorT] = ()) -> ImageIndexT:
+    """Make an image index including given manifests"""
+    return {
+        "schemaVersion": 2,
+        "mediaType": MEDIA_TYPE_OCI_IMAGE_INDEX_V1,
+        "manifests": list(manifests),
+        "annotations": {},
+    }
 
 
 class TestDescriptor:
 
     def test_get_digest(self):
-        descriptor = REFERRER_DESCRIPTOR.copy()
+        descriptor = make_referrer()
         d = Descriptor(data=descriptor)
         assert d.digest == descriptor["digest"]
 
     def test_get_annotations(self):
-        descriptor = REFERRER_DESCRIPTOR.copy()
+        descriptor = make_referrer()
         descriptor["annotations"]["key"] = "value"
         d = Descriptor(data=descriptor)
         assert d.annotations == descriptor["annotations"]
 
+    def test_compare_by_digest(self):
+        descriptor = make_referrer()
+        same_content = make_referrer()
+        same_content["annotations"]["key"] = "value"
+        other_content = make_referrer()
+        other_content["digest"] = generate_digest()
+        d = Descriptor(data=descriptor)
+        assert d == Descriptor(data=same_content)
+        assert d != Descriptor(data=other_content)
+        assert d != descriptor
+        assert len({d, Descriptor(data=same_content), Descriptor(data=other_content)}) == 2
+
+    def test_is_immutable(self):
+        d = Descriptor(data=make_referrer())
+        with pytest.raises(FrozenInstanceError):
+            d.data = make_referrer()  # type: ignore[misc]
+        assert not hasattr(d, "__dict__")
+
 
 def test_image_index_get_manifest() -> None:
     index_json: ImageIndexT = {
         "schemaVersion": 2,
         "mediaType": MEDIA_TYPE_OCI_IMAGE_INDEX_V1,
-        "manifests": [REFERRER_DESCRIPTOR.copy()],
+        "manifests": [make_referrer()],
         "annotations": {},
     }
     manifests = ImageIndex(data=index_json).manifests
@@ -75,42 +198,258 @@ class TestListReferrers:
         with pytest.raises(ValueError, match="Missing digest"):
             Registry().list_referrers(c)
 
-    def _make_list_request(self, count):
+    def _make_list_request(self, count, **registry_kwargs):
         digest = generate_digest()
         c = Container(f"reg.io/ns/app@{digest}")
-        referrers = [
-            REFERRER_DESCRIPTOR.copy(),
-            REFERRER_DESCRIPTOR.copy(),
-            REFERRER_DESCRIPTOR.copy(),
-        ]
-        expected_image_index = copy.deepcopy(IMAGE_INDEX)
-        expected_image_index["manifests"].extend(referrers)
+        # Referrers are only read, hence a single descriptor is shared.
+        referrers = [make_referrer()] * 3
+        expected_image_index = make_image_index(referrers)
         mock_resp = responses.get(f"https://{c.referrers_url}", json=expected_image_index)
         for _ in range(count):
-            image_index = Registry().list_referrers(c)
+            image_index = Registry(**registry_kwargs).list_referrers(c)
             assert image_index["manifests"] == referrers
+            # Modifying the result must not affect the cached one.
+            image_index["manifests"].clear()
         return mock_resp
 
-    @responses.activate
     def test_list_referrers(self):
-        mock_resp = self._make_list_request(2)
+        mock_resp = self._make_list_request(3)
+        assert mock_resp.call_count == 1
+
+    def test_registries_share_cache(self, registry_cache):
+        assert Registry()._cache is Registry()._cache is registry_cache
+        # A registry with its own cache settings does not share the cache.
+        assert Registry(cache_size=10)._cache is not registry_cache
+
+    @pytest.mark.parametrize(
+        "registry_kwargs",
+        [{"cache_size": 0}, {"cache_ttl": 0}],
+        ids=["cache-disabled", "cache-expired"],
+    )
+    def test_list_referrers_without_cache(self, registry_kwargs):
+        mock_resp = self._make_list_request(2, **registry_kwargs)
         assert mock_resp.call_count == 2
 
-    @responses.activate
+    def test_list_referrers_concurrently(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        referrers = [make_referrer()]
+        mock_resp = responses.get(f"https://{c.referrers_url}", json=make_image_index(referrers))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(Registry().list_referrers, c) for _ in range(32)]
+            for future in as_completed(futures):
+                assert future.result()["manifests"] == referrers
+        # Calls either share the in-flight request or get the cached response.
+        assert mock_resp.call_count == 1
+
+    def test_concurrent_calls_share_request(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        referrers = [make_referrer()]
+
+        def _respond(request):
+            # Let the other calls wait for this request.
+            time.sleep(0.2)
+            return 200, {}, json.dumps(make_image_index(referrers))
+
+        mock_resp = responses.add_callback(responses.GET, f"https://{c.referrers_url}", _respond)
+        registry = Registry(cache_size=0)
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(registry.list_referrers, c) for _ in range(10)]
+            image_indexes = [future.result() for future in futures]
+        assert mock_resp.call_count == 1
+        assert all(image_index["manifests"] == referrers for image_index in image_indexes)
+        # Each call gets its own copy.
+        assert len({id(image_index) for image_index in image_indexes}) == 10
+
+    def test_concurrent_calls_share_error(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+
+        def _respond(request):
+            time.sleep(0.2)
+            return 404, {}, ""
+
+        mock_resp = responses.add_callback(responses.GET, f"https://{c.referrers_url}", _respond)
+        registry = Registry()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(registry.list_referrers, c) for _ in range(10)]
+            for future in futures:
+                with pytest.raises(NotFoundError):
+                    future.result()
+        assert mock_resp.call_count == 1
+
+    def test_concurrent_calls_share_interruption(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+
+        class Interrupted(BaseException):
+            pass
+
+        def _respond(request):
+            time.sleep(0.2)
+            raise Interrupted()
+
+        mock_resp = responses.add_callback(responses.GET, f"https://{c.referrers_url}", _respond)
+        registry = Registry()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(registry.list_referrers, c) for _ in range(10)]
+            for future in futures:
+                with pytest.raises(Interrupted):
+                    future.result(timeout=10)
+        assert mock_resp.call_count == 1
+
+    def test_clear_cache(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        mock_resp = responses.get(f"https://{c.referrers_url}", json=make_image_index())
+        registry = Registry()
+        registry.list_referrers(c)
+        registry.clear_cache()
+        registry.list_referrers(c)
+        assert mock_resp.call_count == 2
+
+    def test_evict_least_recently_used_referrers(self):
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        mock_resps = [
+            responses.get(f"https://{c.referrers_url}", json=make_image_index()) for c in containers
+        ]
+        registry = Registry(cache_size=1)
+        for c in [*containers, containers[0]]:
+            registry.list_referrers(c)
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [2, 1]
+
     def test_list_referrers_by_artifact_type(self):
         digest = generate_digest()
         c = Container(f"reg.io/ns/app@{digest}")
-        expected_image_index = copy.deepcopy(IMAGE_INDEX)
-        expected_image_index["manifests"].append(REFERRER_DESCRIPTOR.copy())
+        referrer = make_referrer()
+        expected_image_index = make_image_index([referrer])
         responses.get(
             f"https://{c.referrers_url}?artifactType=text/plain", json=expected_image_index
         )
         image_index = Registry().list_referrers(c, "text/plain")
-        assert image_index["manifests"] == [REFERRER_DESCRIPTOR.copy()]
+        assert image_index["manifests"] == [referrer]
+
+    def _mock_paginated_referrers(self, c: Container) -> tuple[list[DescriptorT], list]:
+        referrers = [make_referrer(), make_referrer()]
+        url = f"https://{c.referrers_url}"
+        next_page = {"n": "1", "last": referrers[0]["digest"]}
+        next_query = urllib.parse.urlencode(next_page)
+        mock_resps = [
+            responses.get(
+                url,
+                json=make_image_index(referrers[:1]),
+                # Relative URL is allowed by the spec
+                headers={
+                    "Link": f'</v2/{c.api_prefix}/referrers/{c.digest}?{next_query}>; rel="next"'
+                },
+                match=[matchers.query_param_matcher({})],
+            ),
+            responses.get(
+                url,
+                json=make_image_index(referrers[1:]),
+                match=[matchers.query_param_matcher(next_page)],
+            ),
+        ]
+        return referrers, mock_resps
+
+    def test_list_paginated_referrers(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        referrers, mock_resps = self._mock_paginated_referrers(c)
+        registry = Registry()
+        assert registry.list_referrers(c)["manifests"] == referrers
+        assert registry.list_referrers(c)["manifests"] == referrers
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
+
+    def test_iter_paginated_referrers(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        referrers, mock_resps = self._mock_paginated_referrers(c)
+        descriptors = Registry().iter_referrers(c)
+        assert next(descriptors) == Descriptor(data=referrers[0])
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 0]
+        assert list(descriptors) == [Descriptor(data=referrers[1])]
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
+
+    def test_iter_cached_referrers(self):
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        referrers, mock_resps = self._mock_paginated_referrers(c)
+        registry = Registry()
+        registry.list_referrers(c)
+        assert list(registry.iter_referrers(c)) == [Descriptor(data=item) for item in referrers]
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
+
+    def test_remember_referrers_api_is_not_supported(self):
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        mock_resps = [responses.get(f"https://{c.referrers_url}", status=404) for c in containers]
+        registry = Registry()
+        with pytest.raises(NotFoundError, match="Not Found"):
+            registry.list_referrers(containers[0])
+        # Another image in the same repository
+        with pytest.raises(NotFoundError, match="not supported by reg.io/ns/app"):
+            registry.list_referrers(containers[1])
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 0]
+
+        registry.clear_cache()
+        with pytest.raises(NotFoundError, match="Not Found"):
+            registry.list_referrers(containers[1])
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
+
+    @pytest.mark.parametrize("error_code", ["MANIFEST_UNKNOWN", "NAME_UNKNOWN"])
+    def test_unknown_image_does_not_mark_referrers_api_unsupported(self, error_code):
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        errors_json = {"errors": [{"code": error_code, "message": "unknown"}]}
+        responses.get(f"https://{containers[0].referrers_url}", json=errors_json, status=404)
+        responses.get(f"https://{containers[1].referrers_url}", json=make_image_index([]))
+        with pytest.raises(NotFoundError, match="Not Found") as exc_info:
+            Registry().list_referrers(containers[0])
+        assert exc_info.value.error_codes == {error_code}
+        # Another image in the same repository
+        assert Registry().list_referrers(containers[1])["manifests"] == []
+
+    def test_not_found_next_page_does_not_mark_referrers_api_unsupported(self):
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        c = containers[0]
+        responses.get(
+            f"https://{c.referrers_url}",
+            json=make_image_index([make_referrer()]),
+            headers={"Link": f'</v2/{c.api_prefix}/referrers/{c.digest}?n=1>; rel="next"'},
+            match=[matchers.query_param_matcher({})],
+        )
+        responses.get(
+            f"https://{c.referrers_url}",
+            status=404,
+            match=[matchers.query_param_matcher({"n": "1"})],
+        )
+        responses.get(f"https://{containers[1].referrers_url}", json=make_image_index([]))
+        with pytest.raises(NotFoundError, match="Not Found"):
+            Registry().list_referrers(c)
+        assert Registry().list_referrers(containers[1])["manifests"] == []
+
+    def test_referrers_api_unsupported_is_not_remembered_without_cache(self):
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        mock_resps = [responses.get(f"https://{c.referrers_url}", status=404) for c in containers]
+        registry = Registry(cache_size=0)
+        for c in containers:
+            with pytest.raises(NotFoundError, match="Not Found"):
+                registry.list_referrers(c)
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
+
+    def test_referrers_api_unsupported_mark_expires(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("time.monotonic", lambda: now)
+        containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+        mock_resps = [
+            responses.get(f"https://{containers[0].referrers_url}", status=404),
+            responses.get(f"https://{containers[1].referrers_url}", json=make_image_index([])),
+        ]
+        with pytest.raises(NotFoundError, match="Not Found"):
+            Registry().list_referrers(containers[0])
+        with pytest.raises(NotFoundError, match="not supported by reg.io/ns/app"):
+            Registry().list_referrers(containers[1])
+
+        # The registry may just have had a transient error, or supports the API now.
+        now += CACHE_TTL
+        assert Registry().list_referrers(containers[1])["manifests"] == []
+        assert [mock_resp.call_count for mock_resp in mock_resps] == [1, 1]
 
-    @responses.activate
     def test_ensure_error_response_is_handled(self, monkeypatch, caplog):
-        monkeypatch.setattr("time.sleep", lambda n: n)  # make oras retry not sleep
+        # Skip the backoff of the session retrying the request on 500
+        monkeypatch.setattr("time.sleep", lambda n: n)
         digest = generate_digest()
         c = Container(f"reg.io/ns/app@{digest}")
         errors_json = {"errors": [{"message": "something is wrong"}]}
@@ -120,7 +459,6 @@ class TestListReferrers:
         assert "something is wrong" in caplog.text
 
 
-@responses.activate
 def test_get_manifest(image_manifest):
     image_digest = generate_digest()
     c = Container(f"reg.io/ns/app@{image_digest}")
@@ -128,7 +466,48 @@ def test_get_manifest(image_manifest):
     assert Registry().get_manifest(c) == image_manifest
 
 
-@responses.activate
+def test_get_manifest_uses_etag(image_manifest):
+    c = Container(f"reg.io/ns/app@{generate_digest()}")
+    url = f"https://{c.manifest_url()}"
+    etag = '"abc"'
+    conditional_resp = responses.get(
+        url, status=304, match=[matchers.header_matcher({"If-None-Match": etag})]
+    )
+    responses.get(url, json=image_manifest, headers={"ETag": etag})
+
+    assert Registry().get_manifest(c) == image_manifest
+    assert conditional_resp.call_count == 0
+    assert Registry().get_manifest(c) == image_manifest
+    assert conditional_resp.call_count == 1
+
+
+def test_evict_least_recently_used_etags(image_manifest):
+    containers = [Container(f"reg.io/ns/app@{generate_digest()}") for _ in range(2)]
+    for c in containers:
+        responses.get(f"https://{c.manifest_url()}", json=image_manifest, headers={"ETag": '"a"'})
+    registry = Registry(cache_size=1)
+    for c in containers:
+        registry.get_manifest(c)
+    # Only the response of the last request is kept.
+    assert list(registry._cache.etags) == [f"https://{containers[1].manifest_url()}"]
+
+
+def test_list_referrers_uses_etag():
+    c = Container(f"reg.io/ns/app@{generate_digest()}")
+    url = f"https://{c.referrers_url}"
+    etag = '"abc"'
+    conditional_resp = responses.get(
+        url, status=304, match=[matchers.header_matcher({"If-None-Match": etag})]
+    )
+    responses.get(url, json=make_image_index(), headers={"ETag": etag})
+
+    # Cached referrers expire immediately, so the second call requests them again.
+    registry = Registry(cache_ttl=0)
+    assert registry.list_referrers(c) == make_image_index()
+    assert registry.list_referrers(c) == make_image_index()
+    assert conditional_resp.call_count == 1
+
+
 def test_get_artifact():
     expected_content = "echo hello world"
     image_digest = generate_digest()
@@ -136,3 +515,173 @@ def test_get_artifact():
     responses.get(f"https://{c.get_blob_url(image_digest)}", body=expected_content.encode("utf-8"))
     content = Registry().get_artifact(c, image_digest)
     assert content == expected_content
+
+
+def test_get_artifact_into_writer():
+    content = b"echo hello world\n" * 10
+    digest = "sha256:" + hashlib.sha256(content).hexdigest()
+    c = Container("reg.io/ns/app")
+    responses.get(f"https://{c.get_blob_url(digest)}", body=content)
+    writer = io.BytesIO()
+    assert Registry().get_artifact(c, digest, writer=writer, chunk_size=16) is None
+    assert writer.getvalue() == content
+
+
+def test_get_artifact_into_writer_with_mismatched_digest():
+    image_digest = generate_digest()
+    c = Container("reg.io/ns/app")
+    responses.get(f"https://{c.get_blob_url(image_digest)}", body=b"echo hello world")
+    with pytest.raises(ValueError, match="does not match its digest"):
+        Registry().get_artifact(c, image_digest, writer=io.BytesIO())
+
+
+@pytest.mark.parametrize("digest", ["1234abcd", "foo:1234abcd"])
+def test_get_artifact_into_writer_with_invalid_digest(digest):
+    writer = io.BytesIO()
+    with pytest.raises(ValueError, match="unsupported digest algorithm"):
+        Registry().get_artifact(Container("reg.io/ns/app"), digest, writer=writer)
+    assert writer.getvalue() == b""
+
+
+class TestRegistrySession:
+
+    def test_retry_on_unavailable_registry(self, registry_session):
+        retry = registry_session.get_adapter("https://reg.io").max_retries
+        assert retry.respect_retry_after_header
+        assert set(retry.status_forcelist) == {429, 500, 502, 503, 504}
+
+    @pytest.mark.parametrize("retry_after,expected", [["3", 3], ["3600", 10], [None, None]])
+    def test_cap_retry_after(self, registry_session, retry_after, expected):
+        retry = registry_session.get_adapter("https://reg.io").max_retries
+        headers = {} if retry_after is None else {"Retry-After": retry_after}
+        response = HTTPResponse(status=503, headers=headers)
+        assert retry.get_retry_after(response) == expected
+        # The cap is kept while the retries are counted down.
+        assert retry.increment(response=response).get_retry_after(response) == expected
+
+    def _make_session(self, **kwargs) -> RegistrySession:
+        session = RegistrySession(**kwargs)
+        # Disable retries, so that each call sends one request.
+        session.mount("https://", HTTPAdapter())
+        return session
+
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    def test_stop_requests_to_failing_registry(self, status):
+        session = self._make_session(failure_threshold=3)
+        mock_resp = responses.get("https://reg.io/v2/", status=status)
+        for _ in range(3):
+            assert session.get("https://reg.io/v2/").status_code == status
+        with pytest.raises(RegistryUnavailableError, match="reg.io are stopped after 3"):
+            session.get("https://reg.io/v2/")
+        assert mock_resp.call_count == 3
+
+        # Other registries are not affected.
+        responses.get("https://reg2.io/v2/")
+        assert session.get("https://reg2.io/v2/").status_code == 200
+
+    def test_count_connection_errors_as_failures(self):
+        session = self._make_session(failure_threshold=1)
+        responses.get("https://reg.io/v2/", body=requests.exceptions.ConnectionError())
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get("https://reg.io/v2/")
+        with pytest.raises(RegistryUnavailableError):
+            session.get("https://reg.io/v2/")
+
+    def test_resume_requests_after_reset_timeout(self):
+        session = self._make_session(failure_threshold=2, reset_timeout=0)
+        responses.get("https://reg.io/v2/", status=500)
+        responses.get("https://reg.io/v2/", status=500)
+        responses.get("https://reg.io/v2/")
+        assert [session.get("https://reg.io/v2/").status_code for _ in range(3)] == [500, 500, 200]
+
+    def test_send_one_request_to_check_registry_is_back(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr("time.monotonic", lambda: now)
+        session = self._make_session(failure_threshold=1, reset_timeout=60)
+        responses.get("https://reg.io/v2/", status=500)
+        assert session.get("https://reg.io/v2/").status_code == 500
+
+        errors = []
+
+        def _respond(request):
+            # Another request sent while the registry is being checked
+            try:
+                session.get("https://reg.io/v2/")
+            except RegistryUnavailableError as e:
+                errors.append(e)
+            return 200, {}, ""
+
+        responses.reset()
+        mock_resp = responses.add_callback(responses.GET, "https://reg.io/v2/", _respond)
+        now += 60
+        assert session.get("https://reg.io/v2/").status_code == 200
+        assert len(errors) == 1
+        assert mock_resp.call_count == 1
+
+        # The registry is back
+        responses.reset()
+        responses.get("https://reg.io/v2/")
+        assert session.get("https://reg.io/v2/").status_code == 200
+
+    def test_success_resets_failures(self):
+        session = self._make_session(failure_threshold=2)
+        responses.get("https://reg.io/v2/", status=500)
+        responses.get("https://reg.io/v2/")
+        responses.get("https://reg.io/v2/", status=500)
+        statuses = [session.get("https://reg.io/v2/").status_code for _ in range(3)]
+        assert statuses == [500, 200, 500]
+        # Failures are not consecutive, hence requests are still sent.
+        session.get("https://reg.io/v2/")
+
+    def test_registry_retries_failing_request_once(self, monkeypatch):
+        sleeps: list[float] = []
+        monkeypatch.setattr("time.sleep", sleeps.append)
+        session = RegistrySession(failure_threshold=2)
+        monkeypatch.setattr("pipeline_migration.registry._shared_session", session)
+        c = Container(f"reg.io/ns/app@{generate_digest()}")
+        mock_resp = responses.get(f"https://{c.referrers_url}", status=500)
+
+        for calls in (1, 2):
+            with pytest.raises(ValueError, match="Internal Server Error"):
+                Registry().list_referrers(c)
+            # The request and 3 retries by the session, which are not retried again by oras.
+            assert mock_resp.call_count == 4 * calls
+        # Only the short backoff between the retries
+        assert sum(sleeps) < 5
+        sleeps.clear()
+
+        with pytest.raises(RegistryUnavailableError):
+            Registry().list_referrers(c)
+        assert mock_resp.call_count == 8
+        assert sleeps == []
+
+
+def test_call_oras_do_request_without_retry():
+    assert _oras_do_request is OrasRegistry.do_request.__wrapped__
+
+
+@pytest.mark.parametrize(
+    "decorate",
+    [
+        pytest.param(lambda func: func, id="not-decorated"),
+        pytest.param(
+            lambda func: retry()(functools.wraps(func)(lambda *args: func(*args))), id="stacked"
+        ),
+        pytest.param(lambda func: functools.wraps(func)(lambda *args: func(*args)), id="other"),
+    ],
+)
+def test_fail_on_unexpected_oras_do_request(decorate, monkeypatch):
+    monkeypatch.setattr(OrasRegistry, "do_request", decorate(_oras_do_request))
+    with pytest.raises(ImportError, match="not decorated by its retry only"):
+        _get_oras_do_request()
+
+
+def test_registries_share_http_session():
+    registries = [Registry() for _ in range(10)]
+    session = registries[0].session
+    assert isinstance(session, RegistrySession)
+    for registry in registries:
+        assert registry.session is session
+        assert registry.auth.session is session
+    adapter = session.get_adapter("https://reg.io")
+    assert adapter.max_retries.total == 3
@@ -1,6 +1,15 @@
+import os
+
 import pytest
-from textwrap import dedent
-from pipeline_migration.utils import YAMLStyle, dump_yaml, load_yaml, BlockSequenceIndentation
+from ruamel.yaml.scanner import ScannerError
+
+from pipeline_migration.utils import (
+    YAMLStyle,
+    dump_yaml,
+    load_yaml,
+    safe_load_yaml,
+    BlockSequenceIndentation,
+)
 
 YAML_EXAMPLE_0_INDENT = """\
 apiVersion: tekton.dev/v1
@@ -98,62 +107,49 @@ spec:
         [YAML_FLOW_SEQ_WITH_VALUES, [True, {2: 1}]],
     ],
 )
-def test_indentation_detection(yaml, expected, tmp_path):
-    yaml_file = tmp_path / "file.yaml"
-    yaml_file.write_text(yaml)
-    ys = YAMLStyle.detect(yaml_file)
+def test_indentation_detection(yaml, expected):
+    ys = YAMLStyle.detect_text(yaml)
     is_consistent, levels = expected
     assert ys.indentation.is_consistent == is_consistent
     assert ys.indentation.levels == list(levels.keys())
     assert ys.indentation.indentations == levels
 
 
+DUMPED_PARAMS_0_INDENT = """\
+params:
+- name: git-url
+- name: revision
+"""
+
+DUMPED_PARAMS_2_INDENTS = """\
+params:
+  - name: git-url
+  - name: revision
+"""
+
+
 @pytest.mark.parametrize(
     "style,data,expected_yaml",
     [
         [
             None,
             {"params": [{"name": "git-url"}, {"name": "revision"}]},
-            dedent(
-                """\
-                params:
-                - name: git-url
-                - name: revision
-                """
-            ),
+            DUMPED_PARAMS_0_INDENT,
         ],
         [
             YAMLStyle(indentation=BlockSequenceIndentation(indentations={0: 1})),
             {"params": [{"name": "git-url"}, {"name": "revision"}]},
-            dedent(
-                """\
-                params:
-                - name: git-url
-                - name: revision
-                """
-            ),
+            DUMPED_PARAMS_0_INDENT,
         ],
         [
             YAMLStyle(indentation=BlockSequenceIndentation(indentations={2: 1})),
             {"params": [{"name": "git-url"}, {"name": "revision"}]},
-            dedent(
-                """\
-                params:
-                  - name: git-url
-                  - name: revision
-                """
-            ),
+            DUMPED_PARAMS_2_INDENTS,
         ],
         [
             YAMLStyle(indentation=BlockSequenceIndentation(indentations={2: 2, 0: 10, 3: 1})),
             {"params": [{"name": "git-url"}, {"name": "revision"}]},
-            dedent(
-                """\
-                params:
-                - name: git-url
-                - name: revision
-                """
-            ),
+            DUMPED_PARAMS_0_INDENT,
         ],
     ],
 )
@@ -174,3 +170,55 @@ def test_dump_same_yaml_with_consistent_indentation_formatting(yaml_content, tmp
     new_file = tmp_path / "new.yaml"
     dump_yaml(new_file, doc, style)
     assert yaml_file.read_text() == new_file.read_text()
+
+
+def test_dump_yaml_does_not_rewrite_unchanged_file(tmp_path):
+    yaml_file = tmp_path / "file.yaml"
+    yaml_file.write_text(YAML_EXAMPLE_0_INDENT)
+    os.utime(yaml_file, ns=(0, 0))
+
+    style = YAMLStyle.detect(yaml_file)
+    doc = load_yaml(yaml_file, style)
+    dump_yaml(yaml_file, doc, style)
+    assert yaml_file.stat().st_mtime_ns == 0
+
+    doc["apiVersion"] = "tekton.dev/v1beta1"
+    dump_yaml(yaml_file, doc, style)
+    assert yaml_file.stat().st_mtime_ns != 0
+    assert load_yaml(yaml_file)["apiVersion"] == "tekton.dev/v1beta1"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(b"kind: Pipeline\r\nspec:\r\n  tasks: []\r\n", id="crlf"),
+        pytest.param(b"kind: Pipeline\nspec:\n  tasks: [\xff]\n", id="not-utf-8"),
+    ],
+)
+def test_dump_yaml_rewrites_file_with_other_bytes(content, tmp_path):
+    yaml_file = tmp_path / "file.yaml"
+    yaml_file.write_bytes(content)
+    dump_yaml(yaml_file, {"kind": "Pipeline", "spec": {"tasks": []}})
+    assert yaml_file.read_bytes() == b"kind: Pipeline\nspec:\n  tasks: []\n"
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ["kind: Pipeline\nspec:\n  tasks: []\n", {"kind": "Pipeline", "spec": {"tasks": []}}],
+        ["# comment\nkind: Pipeline  # the kind\n", {"kind": "Pipeline"}],
+        ["", None],
+        # Rejected by libyaml, but accepted by ruamel.yaml
+        [
+            "params: [{name: url, value: https://example.com}]\n",
+            {"params": [{"name": "url", "value": "https://example.com"}]},
+        ],
+    ],
+)
+def test_safe_load_yaml(content, expected):
+    assert safe_load_yaml(content) == expected
+
+
+def test_safe_load_yaml_with_invalid_content():
+    with pytest.raises(ScannerError):
+        safe_load_yaml("kind: Pipeline\n\tspec: {}\n")
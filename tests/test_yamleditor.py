@@ -1,3 +1,6 @@
+import os
+from unittest.mock import Mock
+
 import pytest
 from textwrap import dedent
 from pathlib import Path
@@ -12,23 +15,143 @@ from pipeline_migration.utils import (
     load_yaml,
     YAMLStyle,
 )
+from tests.utils import read_file_content
+
+SAMPLE_LINES = b"""\
+Line 1
+Line 2
+Line 3
+Line 4
+Line 5
+Line 6
+Line 7
+"""
+
+SIMPLE_YAML = b"""\
+name: test-pipeline
+spec:
+  tasks:
+  - name: task1
+    taskRef:
+      name: clone
+    params:
+    - name: repo-url
+      value: "https://example.com/example/repo"
+"""
+
+SIMPLE_YAML_STYLE2 = b"""\
+name: test-pipeline
+spec:
+  tasks:
+    - name: task1
+      taskRef:
+        name: clone
+      params:
+        - name: repo-url
+          value: "https://example.com/example/repo"
+"""
+
+SIMPLE_YAML_FLOW = b"""\
+name: test-pipeline
+spec:
+  tasks:
+    - name: task1
+      taskRef: {name: clone}
+      params: [{"name": "repo-url", "value": "https://example.com/example/repo"}]
+"""
+
+SCALAR_LIST_YAML = b"""\
+strings:
+  - first
+  - second
+numbers:
+  - 1
+  - 2
+mixed:
+  key1: value1
+  key2: value2
+"""
+
+NEXT_ENTRY_YAML = b"""\
+name: test-pipeline
+spec:
+  tasks:
+    - name: task0
+    - name: task1
+      taskRef:
+        params:
+        - name: name
+          value: task1
+        - name: bundle
+          value: bundle-ref
+        resolver: bundles
+    - name: task2
+      taskRef:
+        name: clone
+      params:
+      - name: param1
+        value: val1
+      - name: param2
+        value: val2
+"""
+
+COMMENTS_YAML = b"""\
+spec:
+    tasks:
+    # comment line
+    - name: init
+      params:
+        # comment as first line in array, data follows
+        - name: image-url
+          value: image  # inline comment
+
+        - name: rebuild
+          # comment between keys
+          value: $(params.rebuild)
+
+    - name: build # build code
+    # comment first, no data follows
+
+    - name: test
+        # indented comment between keys
+      data: ["line1", {name: value}]
+"""
+
+FLOW_STYLE_YAML = b"""\
+metadata: {name: flow-pipeline}
+spec:
+  tasks: [
+    {name: clone, taskRef: {name: git-clone}, params: [
+      {name: url, value: "https://github.com/example/repo"},
+      {name: revision, value: "main"}
+    ]},
+    {name: build, taskRef: {name: build}, params: [
+      {name: IMAGE, value: "buildah"}
+    ]}
+  ]
+"""
 
 
 @pytest.fixture
 def temp_file_with_content(create_yaml_file):
     """Create a temporary file with sample content for testing."""
-    content = dedent(
-        """\
-        Line 1
-        Line 2
-        Line 3
-        Line 4
-        Line 5
-        Line 6
-        Line 7
-        """
-    )
-    return create_yaml_file(content)
+    return create_yaml_file(SAMPLE_LINES)
+
+
+@pytest.fixture(scope="module")
+def simple_yaml_file_ro(tmp_path_factory):
+    """Create the simple YAML file once for the tests that only read it."""
+    yaml_file = tmp_path_factory.mktemp("yaml") / "simple.yaml"
+    yaml_file.write_bytes(SIMPLE_YAML)
+    return yaml_file
+
+
+@pytest.fixture(scope="module")
+def next_entry_yaml_file_ro(tmp_path_factory):
+    """Create the YAML file for finding next entries once, for read-only tests."""
+    yaml_file = tmp_path_factory.mktemp("yaml") / "next_entry.yaml"
+    yaml_file.write_bytes(NEXT_ENTRY_YAML)
+    return yaml_file
 
 
 @pytest.fixture
@@ -37,104 +160,28 @@ def empty_temp_file(create_yaml_file):
     return create_yaml_file("")
 
 
-def read_file_content(file_path: str) -> str:
-    """Helper function to read file content."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
-
-
 class TestRemoveLinesFromFile:
     """Test cases for remove_lines_from_file function."""
 
-    def test_remove_lines_from_middle(self, temp_file_with_content):
-        """Test removing lines from the middle of the file."""
-        remove_lines_from_file(temp_file_with_content, start_line=2, num_lines=2)
-
-        expected = dedent(
-            """\
-            Line 1
-            Line 2
-            Line 5
-            Line 6
-            Line 7
-            """
-        )
-
-        assert read_file_content(temp_file_with_content) == expected
-
-    def test_removal_to_EOF(self, temp_file_with_content):
-        """Test removing lines from the middle to the end of file."""
-        remove_lines_from_file(temp_file_with_content, start_line=2, num_lines=-1)
-
-        expected = dedent(
-            """\
-            Line 1
-            Line 2
-            """
-        )
-
-        assert read_file_content(temp_file_with_content) == expected
-
-    def test_remove_lines_from_beginning(self, temp_file_with_content):
-        """Test removing lines from the beginning of the file."""
-        remove_lines_from_file(temp_file_with_content, start_line=0, num_lines=2)
-
-        expected = dedent(
-            """\
-            Line 3
-            Line 4
-            Line 5
-            Line 6
-            Line 7
-            """
-        )
-
-        assert read_file_content(temp_file_with_content) == expected
-
-    def test_remove_lines_from_end(self, temp_file_with_content):
-        """Test removing lines from the end of the file."""
-        remove_lines_from_file(temp_file_with_content, start_line=5, num_lines=2)
-
-        expected = dedent(
-            """\
-            Line 1
-            Line 2
-            Line 3
-            Line 4
-            Line 5
-            """
-        )
-
-        assert read_file_content(temp_file_with_content) == expected
-
-    def test_remove_more_lines_than_exist(self, temp_file_with_content):
-        """Test removing more lines than exist in the file."""
-        remove_lines_from_file(temp_file_with_content, start_line=4, num_lines=10)
-
-        expected = dedent(
-            """\
-            Line 1
-            Line 2
-            Line 3
-            Line 4
-            """
-        )
+    @pytest.mark.parametrize(
+        "start_line,num_lines,kept_lines",
+        [
+            pytest.param(2, 2, [1, 2, 5, 6, 7], id="from-middle"),
+            pytest.param(2, -1, [1, 2], id="to-EOF"),
+            pytest.param(0, 2, [3, 4, 5, 6, 7], id="from-beginning"),
+            pytest.param(5, 2, [1, 2, 3, 4, 5], id="from-end"),
+            pytest.param(4, 10, [1, 2, 3, 4], id="more-lines-than-exist"),
+            pytest.param(2, 0, [1, 2, 3, 4, 5, 6, 7], id="zero-lines"),
+            pytest.param(0, 10, [], id="all-lines"),
+        ],
+    )
+    def test_remove_lines(self, start_line, num_lines, kept_lines, temp_file_with_content):
+        """Test removing a block of lines from the 7-line sample file."""
+        remove_lines_from_file(temp_file_with_content, start_line=start_line, num_lines=num_lines)
 
+        expected = "".join(f"Line {n}\n" for n in kept_lines)
         assert read_file_content(temp_file_with_content) == expected
 
-    def test_remove_zero_lines(self, temp_file_with_content):
-        """Test removing zero lines (should do nothing)."""
-        original_content = read_file_content(temp_file_with_content)
-        remove_lines_from_file(temp_file_with_content, start_line=2, num_lines=0)
-
-        assert read_file_content(temp_file_with_content) == original_content
-
-    def test_remove_all_lines(self, temp_file_with_content):
-        """Test removing all lines from the file."""
-        remove_lines_from_file(temp_file_with_content, start_line=0, num_lines=10)
-
-        assert read_file_content(temp_file_with_content) == ""
-
     def test_invalid_start_line_negative(self, temp_file_with_content):
         """Test error when start_line is negative."""
         with pytest.raises(ValueError, match="start_line must be >= 0"):
@@ -142,22 +189,50 @@ class TestRemoveLinesFromFile:
 
     def test_start_line_beyond_file_length(self, temp_file_with_content):
         """Test error when start_line is beyond file length."""
-        with pytest.raises(
-            ValueError, match="start_line \\(10\\) is beyond the file length \\(max index: 6\\)"
-        ):
+        with pytest.raises(ValueError) as exc_info:
             remove_lines_from_file(temp_file_with_content, start_line=10, num_lines=1)
+        assert str(exc_info.value) == "start_line (10) is beyond the file length (max index: 6)"
 
     def test_file_not_found(self):
         """Test error when file doesn't exist."""
         with pytest.raises(FileNotFoundError):
             remove_lines_from_file("nonexistent.txt", start_line=1, num_lines=1)
 
+    def test_remove_lines_keeps_content_bytes(self, tmp_path):
+        """Test remaining lines are kept byte by byte, including line endings."""
+        file_path = tmp_path / "crlf.yaml"
+        file_path.write_bytes("Line 1\r\nLine 2\r\nLine 3 \u2713\r\nLine 4".encode("utf-8"))
+        remove_lines_from_file(file_path, start_line=1, num_lines=1)
+
+        assert file_path.read_bytes() == "Line 1\r\nLine 3 \u2713\r\nLine 4".encode("utf-8")
+
+    def test_remove_zero_lines_skips_file_access(self, tmp_path):
+        """Test removing zero lines returns before the file is opened."""
+        file_path = tmp_path / "nonexistent.yaml"
+        remove_lines_from_file(file_path, start_line=2, num_lines=0)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("sendfile", ["supported", "unsupported", "fails"])
+    def test_remove_lines_copies_tail_in_chunks(
+        self, sendfile, temp_file_with_content, monkeypatch
+    ):
+        """Test the remaining content is copied completely when it spans several chunks."""
+        monkeypatch.setattr("pipeline_migration.yamleditor.COPY_CHUNK_SIZE", 4)
+        if sendfile == "unsupported":
+            monkeypatch.delattr(os, "sendfile", raising=False)
+        elif sendfile == "fails":
+            monkeypatch.setattr(os, "sendfile", Mock(side_effect=OSError("not supported")))
+        remove_lines_from_file(temp_file_with_content, start_line=1, num_lines=1)
+
+        expected = "".join(f"Line {n}\n" for n in [1, 3, 4, 5, 6, 7])
+        assert read_file_content(temp_file_with_content) == expected
+
     def test_remove_from_empty_file(self, empty_temp_file):
         """Test removing lines from an empty file."""
-        with pytest.raises(
-            ValueError, match="start_line \\(0\\) is beyond the file length \\(max index: -1\\)"
-        ):
+        with pytest.raises(ValueError) as exc_info:
             remove_lines_from_file(empty_temp_file, start_line=0, num_lines=1)
+        assert str(exc_info.value) == "start_line (0) is beyond the file length (max index: -1)"
 
 
 class TestInsertTextAtLine:
@@ -379,6 +454,14 @@ class TestInsertTextAtLine:
         expected = "First Line\n"
         assert read_file_content(empty_temp_file) == expected
 
+    def test_insert_keeps_content_bytes(self, tmp_path):
+        """Test original lines are kept byte by byte, including line endings."""
+        file_path = tmp_path / "crlf.yaml"
+        file_path.write_bytes("Line 1\r\nLine 2 \u2713\r\nLine 3\r\n".encode("utf-8"))
+        insert_text_at_line(file_path, 1, "New Line", replace_lines=1)
+
+        assert file_path.read_bytes() == "Line 1\r\nNew Line\nLine 3\r\n".encode("utf-8")
+
 
 class TestEditYAMLEntry:
     """Test cases for EditYAMLEntry class."""
@@ -386,57 +469,18 @@ class TestEditYAMLEntry:
     @pytest.fixture
     def simple_yaml_file(self, create_yaml_file):
         """Create a temporary YAML file with simple structure."""
-        content = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-              - name: task1
-                taskRef:
-                  name: clone
-                params:
-                - name: repo-url
-                  value: "https://example.com/example/repo"
-            """
-        )
-
-        return create_yaml_file(content)
+        return create_yaml_file(SIMPLE_YAML)
 
     @pytest.fixture
     def simple_yaml_file_style2(self, create_yaml_file):
         """Create a temporary YAML file with simple structure.
         Extra indentation of the list entries."""
-        content = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef:
-                    name: clone
-                  params:
-                    - name: repo-url
-                      value: "https://example.com/example/repo"
-            """
-        )
-
-        return create_yaml_file(content)
+        return create_yaml_file(SIMPLE_YAML_STYLE2)
 
     @pytest.fixture
     def simple_yaml_file_flow(self, create_yaml_file):
         """Create a temporary YAML file with simple structure and flow style."""
-        content = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef: {name: clone}
-                  params: [{"name": "repo-url", "value": "https://example.com/example/repo"}]
-            """
-        )
-
-        return create_yaml_file(content)
+        return create_yaml_file(SIMPLE_YAML_FLOW)
 
     @pytest.fixture
     def empty_yaml_file(self, create_yaml_file):
@@ -448,61 +492,17 @@ class TestEditYAMLEntry:
     @pytest.fixture
     def scalar_list_yaml_file(self, create_yaml_file):
         """Create a YAML file with lists containing scalar values."""
-        content = dedent(
-            """\
-            strings:
-              - first
-              - second
-            numbers:
-              - 1
-              - 2
-            mixed:
-              key1: value1
-              key2: value2
-            """
-        )
+        return create_yaml_file(SCALAR_LIST_YAML)
 
-        return create_yaml_file(content)
-
-    @pytest.fixture
-    def get_next_entry_test_yaml_file(self, create_yaml_file):
-        """Create a temporary YAML file with simple structure."""
-        content = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task0
-                - name: task1
-                  taskRef:
-                    params:
-                    - name: name
-                      value: task1
-                    - name: bundle
-                      value: bundle-ref
-                    resolver: bundles
-                - name: task2
-                  taskRef:
-                    name: clone
-                  params:
-                  - name: param1
-                    value: val1
-                  - name: param2
-                    value: val2
-            """
-        )
-
-        return create_yaml_file(content)
-
-    def test_initialization(self, simple_yaml_file):
+    def test_initialization(self, simple_yaml_file_ro):
         """Test EditYAMLEntry initialization."""
-        editor = EditYAMLEntry(simple_yaml_file)
-        assert editor.yaml_file_path == simple_yaml_file
+        editor = EditYAMLEntry(simple_yaml_file_ro)
+        assert editor.yaml_file_path == simple_yaml_file_ro
         assert editor._data is None
 
-    def test_data_property_loading(self, simple_yaml_file):
+    def test_data_property_loading(self, simple_yaml_file_ro):
         """Test that data property loads YAML content."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         data = editor.data
 
         assert data is not None
@@ -511,36 +511,36 @@ class TestEditYAMLEntry:
         assert "tasks" in data["spec"]
         assert len(data["spec"]["tasks"]) == 1
 
-    def test_data_property_caching(self, simple_yaml_file):
+    def test_data_property_caching(self, simple_yaml_file_ro):
         """Test that data property caches the loaded data."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         data1 = editor.data
         data2 = editor.data
 
         # Should return the same object instance (cached)
         assert data1 is data2
 
-    def test_data_deleter(self, simple_yaml_file):
+    def test_data_deleter(self, simple_yaml_file_ro):
         """Test data property deleter."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         _ = editor.data  # Load data
         assert editor._data is not None
 
         del editor.data
         assert editor._data is None
 
-    def test_invalidate_yaml_data(self, simple_yaml_file):
+    def test_invalidate_yaml_data(self, simple_yaml_file_ro):
         """Test invalidate_yaml_data method."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         _ = editor.data  # Load data
         assert editor._data is not None
 
         editor.invalidate_yaml_data()
         assert editor._data is None
 
-    def test_get_path_stack_dict(self, simple_yaml_file):
+    def test_get_path_stack_dict(self, simple_yaml_file_ro):
         """Test _get_path_stack with dictionary paths."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         path_stack = editor._get_path_stack(["spec", "tasks", 0, "params"])
 
         assert len(path_stack) == 5  # root -> spec -> tasks -> params + terminal
@@ -550,9 +550,9 @@ class TestEditYAMLEntry:
         assert path_stack[3][1] == "params"
         assert path_stack[4][1] is None  # terminal node
 
-    def test_get_path_stack_list(self, simple_yaml_file):
+    def test_get_path_stack_list(self, simple_yaml_file_ro):
         """Test _get_path_stack with list indices."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
         path_stack = editor._get_path_stack(["spec", "tasks", 0])
 
         assert len(path_stack) == 4  # root -> spec -> tasks -> index 0 + terminal
@@ -933,9 +933,7 @@ class TestEditYAMLEntry:
             """
         )
 
-        with open(simple_yaml_file, "r") as f:
-            content = f.read()
-            assert content == expected
+        assert read_file_content(simple_yaml_file) == expected
 
     def test_delete_scalar_from_dict(self, simple_yaml_file):
         """Test deleting a scalar value from a dictionary."""
@@ -1010,23 +1008,23 @@ class TestEditYAMLEntry:
         with pytest.raises(FileNotFoundError):
             _ = editor.data
 
-    def test_invalid_path_key_error(self, simple_yaml_file):
+    def test_invalid_path_key_error(self, simple_yaml_file_ro):
         """Test error when path contains non-existent key."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
 
         with pytest.raises(KeyError):
             editor._get_path_stack(["non_existent_key"])
 
-    def test_invalid_path_index_error(self, simple_yaml_file):
+    def test_invalid_path_index_error(self, simple_yaml_file_ro):
         """Test error when path contains invalid list index."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
 
         with pytest.raises(IndexError):
             editor._get_path_stack(["spec", "tasks", 999])
 
-    def test_invalid_path_type_assertion(self, simple_yaml_file):
+    def test_invalid_path_type_assertion(self, simple_yaml_file_ro):
         """Test assertion error when path contains invalid type."""
-        editor = EditYAMLEntry(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file_ro)
 
         with pytest.raises(AssertionError):
             editor._get_path_stack([123.45])  # float is not allowed
@@ -1087,6 +1085,117 @@ class TestEditYAMLEntry:
 
         assert read_file_content(simple_yaml_file) == expected
 
+    def test_multiple_operations_in_batch(self, simple_yaml_file, monkeypatch):
+        """Test YAML validity is checked once for a batch of operations."""
+        validated_files = []
+        monkeypatch.setattr(
+            "pipeline_migration.yamleditor.post_test_yaml_validity", validated_files.append
+        )
+        style = YAMLStyle.detect(simple_yaml_file)
+
+        with EditYAMLEntry(simple_yaml_file, style) as editor:
+            editor.insert(["spec", "tasks"], {"name": "task2", "taskRef": {"name": "deploy"}})
+            editor.delete(["spec", "tasks", 0, "params", 0])
+
+        expected = dedent(
+            """\
+            name: test-pipeline
+            spec:
+              tasks:
+              - name: task1
+                taskRef:
+                  name: clone
+              - name: task2
+                taskRef:
+                  name: deploy
+            """
+        )
+
+        assert read_file_content(simple_yaml_file) == expected
+        assert validated_files == [simple_yaml_file]
+
+    def test_apply_edits(self, simple_yaml_file, monkeypatch):
+        """Test applying edits in a batch."""
+        validated_files = []
+        monkeypatch.setattr(
+            "pipeline_migration.yamleditor.post_test_yaml_validity", validated_files.append
+        )
+        editor = EditYAMLEntry(simple_yaml_file, YAMLStyle.detect(simple_yaml_file))
+
+        editor.apply_edits(
+            [
+                {"kind": "replace", "path": ["name"], "data": "updated-pipeline"},
+                {
+                    "kind": "insert",
+                    "path": ["spec", "tasks"],
+                    "data": {"name": "task2", "taskRef": {"name": "deploy"}},
+                },
+                {"kind": "delete", "path": ["spec", "tasks", 0, "params"]},
+            ]
+        )
+
+        expected = dedent(
+            """\
+            name: updated-pipeline
+            spec:
+              tasks:
+              - name: task1
+                taskRef:
+                  name: clone
+              - name: task2
+                taskRef:
+                  name: deploy
+            """
+        )
+
+        assert read_file_content(simple_yaml_file) == expected
+        assert validated_files == [simple_yaml_file]
+
+    def test_apply_edits_with_unknown_kind(self, simple_yaml_file):
+        """Test an unknown edit kind fails the batch and keeps the original content."""
+        original_content = read_file_content(simple_yaml_file)
+        editor = EditYAMLEntry(simple_yaml_file)
+
+        with pytest.raises(ValueError, match="Unknown edit kind: move"):
+            editor.apply_edits(
+                [
+                    {"kind": "replace", "path": ["name"], "data": "updated-pipeline"},
+                    {"kind": "move", "path": ["name"]},
+                ]
+            )
+
+        assert read_file_content(simple_yaml_file) == original_content
+
+    def test_batch_restores_file_on_error(self, simple_yaml_file):
+        """Test the original content is restored if an operation of a batch fails."""
+        original_content = read_file_content(simple_yaml_file)
+        style = YAMLStyle.detect(simple_yaml_file)
+
+        with pytest.raises(ValueError, match="Only dict values"):
+            with EditYAMLEntry(simple_yaml_file, style) as editor:
+                editor.replace(["name"], "updated-pipeline")
+                editor.insert(["spec"], "not a dict")
+
+        assert read_file_content(simple_yaml_file) == original_content
+        assert editor.data["name"] == "test-pipeline"
+
+    def test_batch_restores_file_if_result_is_invalid(self, simple_yaml_file, monkeypatch):
+        """Test the original content is restored if a batch results in invalid YAML."""
+        original_content = read_file_content(simple_yaml_file)
+
+        def _fail_validation(path):
+            raise RuntimeError("post-check: generated YAML is not valid")
+
+        monkeypatch.setattr(
+            "pipeline_migration.yamleditor.post_test_yaml_validity", _fail_validation
+        )
+
+        with pytest.raises(RuntimeError, match="not valid"):
+            with EditYAMLEntry(simple_yaml_file) as editor:
+                editor.replace(["name"], "updated-pipeline")
+
+        assert read_file_content(simple_yaml_file) == original_content
+
     def test_replace_string_scalar_in_dict(self, simple_yaml_file):
         """Test replacing a string scalar value in a dictionary."""
         style = YAMLStyle.detect(simple_yaml_file)
@@ -1193,9 +1302,9 @@ class TestEditYAMLEntry:
             (["spec", "tasks", 2, "params", 1], EOF),
         ],
     )
-    def test__get_next_entry_line(self, get_next_entry_test_yaml_file, yaml_path, expected_lineno):
+    def test__get_next_entry_line(self, next_entry_yaml_file_ro, yaml_path, expected_lineno):
         """Test cases for EditYAMLEntry._get_next_entry_line method. (lineno starts with 0)"""
-        editor = EditYAMLEntry(get_next_entry_test_yaml_file)
+        editor = EditYAMLEntry(next_entry_yaml_file_ro)
         path_stack = editor._get_path_stack(yaml_path)
         assert editor._get_next_entry_line(path_stack) == expected_lineno
 
@@ -1205,30 +1314,7 @@ class TestEditYAMLEntryComments:
 
     @pytest.fixture
     def comments_yaml_file(self, create_yaml_file):
-        content = dedent(
-            """\
-            spec:
-                tasks:
-                # comment line
-                - name: init
-                  params:
-                    # comment as first line in array, data follows
-                    - name: image-url
-                      value: image  # inline comment
-
-                    - name: rebuild
-                      # comment between keys
-                      value: $(params.rebuild)
-
-                - name: build # build code
-                # comment first, no data follows
-
-                - name: test
-                    # indented comment between keys
-                  data: ["line1", {name: value}]
-            """
-        )
-        return create_yaml_file(content)
+        return create_yaml_file(COMMENTS_YAML)
 
     def test_insert_into_empty_commented_section(self, comments_yaml_file):
         editor = EditYAMLEntry(comments_yaml_file)
@@ -1411,38 +1497,12 @@ class TestEditYAMLEntryFlowStyle:
     @pytest.fixture
     def simple_yaml_file_flow(self, create_yaml_file):
         """Create a temporary YAML file with simple structure and flow style."""
-        content = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef: {name: clone}
-                  params: [{"name": "repo-url", "value": "https://example.com/example/repo"}]
-            """
-        )
-
-        return create_yaml_file(content)
+        return create_yaml_file(SIMPLE_YAML_FLOW)
 
     @pytest.fixture
     def flow_style_yaml_file(self, create_yaml_file):
         """A YAML with flow-style lists and mappings under spec."""
-        content = dedent(
-            """\
-            metadata: {name: flow-pipeline}
-            spec:
-              tasks: [
-                {name: clone, taskRef: {name: git-clone}, params: [
-                  {name: url, value: "https://github.com/example/repo"},
-                  {name: revision, value: "main"}
-                ]},
-                {name: build, taskRef: {name: build}, params: [
-                  {name: IMAGE, value: "buildah"}
-                ]}
-              ]
-            """
-        )
-        return create_yaml_file(content)
+        return create_yaml_file(FLOW_STYLE_YAML)
 
     @pytest.fixture
     def root_flow_seq_file(self, create_yaml_file):
@@ -1462,74 +1522,67 @@ class TestEditYAMLEntryFlowStyle:
         content = """items: [first, second]\n"""
         return create_yaml_file(content)
 
-    def test_replace_list_item_flow_simple(self, simple_yaml_file_flow):
-        """Test replacing an item in a list."""
-        editor = EditYAMLEntry(simple_yaml_file_flow)
-
-        new_item = {"name": "replaced-item", "value": 999}
-        editor.replace(["spec", "tasks", 0, "params", 0], new_item)
-
-        expected = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef: {name: clone}
-                  params:
-                  - name: replaced-item
-                    value: 999
-            """
-        )
-
-        with open(simple_yaml_file_flow, "r") as f:
-            content = f.read()
-            assert content == expected
-
-    def test_insert_into_list_flow_simple(self, simple_yaml_file_flow):
-        """Test inserting new item into a list."""
-        editor = EditYAMLEntry(simple_yaml_file_flow)
-
-        new_data = {"name": "new-param", "value": "new-value"}
-        editor.insert(["spec", "tasks", 0, "params"], new_data)
-
-        expected = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef: {name: clone}
-                  params:
-                  - {name: repo-url, value: https://example.com/example/repo}
-                  - name: new-param
-                    value: new-value
-            """
-        )
-
-        with open(simple_yaml_file_flow, "r") as f:
-            content = f.read()
-            assert content == expected
-
-    def test_delete_from_list_flow(self, simple_yaml_file_flow):
-        """Test deleting an item from a list."""
+    @pytest.mark.parametrize(
+        "operation,args,expected",
+        [
+            pytest.param(
+                "replace",
+                (["spec", "tasks", 0, "params", 0], {"name": "replaced-item", "value": 999}),
+                dedent(
+                    """\
+                    name: test-pipeline
+                    spec:
+                      tasks:
+                        - name: task1
+                          taskRef: {name: clone}
+                          params:
+                          - name: replaced-item
+                            value: 999
+                    """
+                ),
+                id="replace-list-item",
+            ),
+            pytest.param(
+                "insert",
+                (["spec", "tasks", 0, "params"], {"name": "new-param", "value": "new-value"}),
+                dedent(
+                    """\
+                    name: test-pipeline
+                    spec:
+                      tasks:
+                        - name: task1
+                          taskRef: {name: clone}
+                          params:
+                          - {name: repo-url, value: https://example.com/example/repo}
+                          - name: new-param
+                            value: new-value
+                    """
+                ),
+                id="insert-into-list",
+            ),
+            pytest.param(
+                "delete",
+                (["spec", "tasks", 0, "params", 0],),
+                dedent(
+                    """\
+                    name: test-pipeline
+                    spec:
+                      tasks:
+                        - name: task1
+                          taskRef: {name: clone}
+                    """
+                ),
+                id="delete-from-list",
+            ),
+        ],
+    )
+    def test_edit_list_flow_simple(self, operation, args, expected, simple_yaml_file_flow):
+        """Test replacing, inserting and deleting an item of a flow-style list."""
         editor = EditYAMLEntry(simple_yaml_file_flow)
 
-        editor.delete(["spec", "tasks", 0, "params", 0])
+        getattr(editor, operation)(*args)
 
-        expected = dedent(
-            """\
-            name: test-pipeline
-            spec:
-              tasks:
-                - name: task1
-                  taskRef: {name: clone}
-            """
-        )
-
-        with open(simple_yaml_file_flow, "r") as f:
-            content = f.read()
-            assert content == expected
+        assert read_file_content(simple_yaml_file_flow) == expected
 
     def test_insert_into_flow_style_list_converts_to_block_and_appends(self, flow_style_yaml_file):
         editor = EditYAMLEntry(flow_style_yaml_file)
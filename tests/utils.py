@@ -1,8 +1,8 @@
-import random
-import string
+import hashlib
 import time
-from itertools import count
+from itertools import count, cycle
 from pathlib import Path
+from secrets import token_hex
 
 
 class RepoPath(Path):
@@ -11,28 +11,36 @@ class RepoPath(Path):
         return self / ".tekton"
 
 
-def select_random_chars(n=64):
-    return (random.choice(string.hexdigits) for _ in range(n))
+# Digests handed out by generate_digest. Tests only need distinct digest-like values, which
+# are computed once here rather than drawing random characters for every digest.
+_DIGEST_POOL = [
+    "sha256:" + hashlib.sha256(i.to_bytes(8, "little")).hexdigest() for i in range(1024)
+]
+_digests = cycle(_DIGEST_POOL)
 
 
 def generate_digest() -> str:
-    random_choices = select_random_chars()
-    return "sha256:" + "".join(random_choices).lower()
+    return next(_digests)
 
 
 def generate_git_sha() -> str:
-    return "".join(select_random_chars(40)).lower()
+    return token_hex(20)
 
 
 def generate_sha256sum() -> str:
-    random_choices = select_random_chars()
-    return "".join(random_choices).lower()
+    return token_hex(32)
 
 
 def generate_timestamp():
+    now = int(time.time())
     counter = count()
 
     def _inner() -> int:
-        return int(time.time()) - next(counter)
+        return now - next(counter)
 
     return _inner
+
+
+def read_file_content(file_path: str | Path) -> str:
+    """Helper function to read file content."""
+    return Path(file_path).read_bytes().decode("utf-8")